@@ -0,0 +1,230 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Benchmark the record views with the Flask test client.
+
+Usage::
+
+    python benchmarks/bench_views.py --requests 200 --output results.json
+    python benchmarks/bench_views.py --config RECORDS_UI_PID_CACHE=true
+
+The results are written as JSON, with the latency percentiles in
+milliseconds and the throughput in requests per second of each scenario.
+"""
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+
+from fixtures import GRADES, create_app, create_records
+
+PACKAGES = (
+    "flask",
+    "werkzeug",
+    "sqlalchemy",
+    "invenio-db",
+    "invenio-pidstore",
+    "invenio-records",
+    "invenio-records-ui",
+)
+"""Packages whose versions are included in the results."""
+
+
+def scenarios(pids):
+    """Get the benchmarked scenarios.
+
+    :param pids: Persistent identifier values returned by
+        ``fixtures.create_records``.
+    :returns: List of tuples (name, URLs, expected status code).
+    """
+    result = []
+    for grade in sorted(GRADES):
+        values = pids["record:{0}".format(grade)]
+        result.append(
+            (
+                "record:{0}".format(grade),
+                ["/records/{0}".format(v) for v in values],
+                200,
+            )
+        )
+        result.append(
+            (
+                "export:{0}".format(grade),
+                ["/records/{0}/export/json".format(v) for v in values],
+                200,
+            )
+        )
+    result.append(
+        ("tombstone", ["/records/{0}".format(v) for v in pids["tombstone"]], 410)
+    )
+    result.append(
+        ("redirect", ["/records/{0}".format(v) for v in pids["redirect"]], 302)
+    )
+    result.append(
+        ("not_found", ["/records/{0}".format(v) for v in pids["not_found"]], 404)
+    )
+    return result
+
+
+def percentile(values, fraction):
+    """Get a percentile of sorted values by the nearest-rank method.
+
+    :param values: Sorted list of values.
+    :param fraction: Percentile as a fraction, e.g. ``0.95``.
+    """
+    index = max(int(round(fraction * len(values) + 0.5)) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+def run_scenario(client, urls, status, requests, warmup):
+    """Request the URLs in turn and measure the latencies.
+
+    :param client: Flask test client.
+    :param urls: URLs to request.
+    :param status: Expected status code.
+    :param requests: Number of measured requests.
+    :param warmup: Number of requests made before measuring.
+    :returns: Dictionary of the statistics.
+    """
+    for index in range(warmup):
+        client.get(urls[index % len(urls)])
+
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for index in range(requests):
+        start = time.perf_counter()
+        response = client.get(urls[index % len(urls)])
+        response.get_data()
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != status:
+            errors += 1
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    milliseconds = [latency * 1000 for latency in latencies]
+    return dict(
+        requests=requests,
+        errors=errors,
+        status=status,
+        throughput=requests / elapsed,
+        min_ms=milliseconds[0],
+        mean_ms=sum(milliseconds) / len(milliseconds),
+        p50_ms=percentile(milliseconds, 0.5),
+        p95_ms=percentile(milliseconds, 0.95),
+        p99_ms=percentile(milliseconds, 0.99),
+        max_ms=milliseconds[-1],
+    )
+
+
+def package_versions():
+    """Get the versions of the packages relevant to the results."""
+    versions = {}
+    for name in PACKAGES:
+        try:
+            versions[name] = version(name)
+        except PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def parse_config(items):
+    """Parse ``KEY=VALUE`` configuration items, with JSON values.
+
+    :param items: List of items. Values which are not valid JSON are taken
+        as strings.
+    :returns: Dictionary.
+    """
+    config = {}
+    for item in items:
+        key, dummy, value = item.partition("=")
+        try:
+            config[key] = json.loads(value)
+        except ValueError:
+            config[key] = value
+    return config
+
+
+def main(argv=None):
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--database", default="sqlite://", help="SQLAlchemy database URI."
+    )
+    parser.add_argument(
+        "--records", type=int, default=10, help="Records per grade and state."
+    )
+    parser.add_argument(
+        "--requests", type=int, default=100, help="Measured requests per scenario."
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=10, help="Requests per scenario before measuring."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the records.")
+    parser.add_argument(
+        "--config",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Application configuration, e.g. RECORDS_UI_PAGE_CACHE_SIZE=100.",
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        default=[],
+        help="Only run the given scenarios, e.g. record:large.",
+    )
+    parser.add_argument("--output", help="Write the results to a file.")
+    args = parser.parse_args(argv)
+
+    config = parse_config(args.config)
+    app = create_app(args.database, config)
+    pids = create_records(app, records=args.records, seed=args.seed)
+
+    results = []
+    with app.test_client() as client:
+        for name, urls, status in scenarios(pids):
+            if args.scenario and name not in args.scenario:
+                continue
+            result = run_scenario(client, urls, status, args.requests, args.warmup)
+            result["scenario"] = name
+            results.append(result)
+            print(
+                "{0:<15} p50 {1:8.3f} ms  p95 {2:8.3f} ms  {3:9.1f} req/s".format(
+                    name, result["p50_ms"], result["p95_ms"], result["throughput"]
+                ),
+                file=sys.stderr,
+            )
+
+    output = dict(
+        created=datetime.now(timezone.utc).isoformat(),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        packages=package_versions(),
+        options=dict(
+            database=args.database,
+            records=args.records,
+            requests=args.requests,
+            warmup=args.warmup,
+            seed=args.seed,
+            config=args.config,
+        ),
+        results=results,
+    )
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(output, fp, indent=2, sort_keys=True)
+    else:
+        json.dump(output, sys.stdout, indent=2, sort_keys=True)
+        print()
+    return 1 if any(result["errors"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
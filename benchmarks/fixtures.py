@@ -0,0 +1,150 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Application and synthetic records for the benchmarks."""
+
+from __future__ import absolute_import, print_function
+
+import json
+import random
+import uuid
+
+from flask import Flask
+from invenio_db import InvenioDB, db
+from invenio_i18n import Babel
+from invenio_pidstore import InvenioPIDStore
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus
+from invenio_records import InvenioRecords
+from invenio_records.api import Record
+
+from invenio_records_ui import InvenioRecordsUI
+from invenio_records_ui.views import create_blueprint_from_app
+
+GRADES = dict(
+    small=dict(keys=10, depth=1),
+    medium=dict(keys=30, depth=3),
+    large=dict(keys=100, depth=4),
+)
+"""Number of top-level keys and nesting depth of the synthetic records."""
+
+
+class JSONSerializer(object):
+    """JSON serializer of the ``json`` export format."""
+
+    def serialize(self, pid, record):
+        """Serialize a record to JSON.
+
+        :param pid: Persistent identifier.
+        :param record: Record.
+        """
+        return json.dumps(record, sort_keys=True, indent=2)
+
+
+def create_app(database="sqlite://", config=None):
+    """Create an application serving the records UI.
+
+    :param database: SQLAlchemy database URI.
+    :param config: Additional configuration, e.g. to enable caches.
+    :returns: The application, with the database tables created.
+    """
+    app = Flask("benchmark")
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=database,
+        RECORDS_UI_DEFAULT_PERMISSION_FACTORY=None,
+        RECORDS_UI_EXPORT_FORMATS=dict(
+            recid=dict(
+                json=dict(
+                    title="JSON",
+                    serializer=JSONSerializer(),
+                    order=1,
+                )
+            )
+        ),
+    )
+    app.config.update(config or {})
+    Babel(app)
+    InvenioDB(app)
+    InvenioPIDStore(app)
+    InvenioRecords(app)
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def generate_metadata(keys, depth, rng):
+    """Generate synthetic record metadata.
+
+    :param keys: Number of keys of the top-level mapping. Nested mappings
+        have a fifth of the keys of their parent, and at least two.
+    :param depth: Nesting depth of mappings and lists.
+    :param rng: ``random.Random`` instance.
+    :returns: Dictionary.
+    """
+    data = {}
+    for index in range(keys):
+        kind = index % 4
+        if depth > 1 and kind == 0:
+            value = generate_metadata(max(keys // 5, 2), depth - 1, rng)
+        elif depth > 1 and kind == 1:
+            value = [
+                generate_metadata(max(keys // 5, 2), depth - 1, rng)
+                for dummy in range(3)
+            ]
+        elif kind == 2:
+            value = [rng.randint(0, 10**6) for dummy in range(5)]
+        else:
+            value = "".join(rng.choice("abcdefghij ") for dummy in range(40))
+        data["field_{0}".format(index)] = value
+    return data
+
+
+def create_records(app, records=10, seed=0):
+    """Create records and persistent identifiers in all states.
+
+    :param app: Application created with :func:`create_app`.
+    :param records: Number of records per grade and state.
+    :param seed: Seed of the generated metadata.
+    :returns: Dictionary of lists of persistent identifier values by kind:
+        one ``record:<grade>`` kind per grade, ``tombstone``, ``redirect``
+        and ``not_found``.
+    """
+    rng = random.Random(seed)
+    pids = dict(tombstone=[], redirect=[], not_found=[])
+    counter = iter(range(1, 10**9))
+    with app.app_context():
+        for grade, options in sorted(GRADES.items()):
+            values = pids["record:{0}".format(grade)] = []
+            for dummy in range(records):
+                values.append(_create_record(next(counter), options, rng).pid_value)
+        for dummy in range(records):
+            pid = _create_record(next(counter), GRADES["small"], rng)
+            pid.delete()
+            pids["tombstone"].append(pid.pid_value)
+
+            target = PersistentIdentifier.get("recid", pids["record:small"][0])
+            pid = PersistentIdentifier.create(
+                "recid", str(next(counter)), status=PIDStatus.REGISTERED
+            )
+            pid.redirect(target)
+            pids["redirect"].append(pid.pid_value)
+            pids["not_found"].append(str(10**9 + next(counter)))
+        db.session.commit()
+    return pids
+
+
+def _create_record(pid_value, options, rng):
+    """Create a registered persistent identifier and its record."""
+    rec_uuid = uuid.uuid4()
+    pid = PersistentIdentifier.create(
+        "recid",
+        str(pid_value),
+        object_type="rec",
+        object_uuid=rec_uuid,
+        status=PIDStatus.REGISTERED,
+    )
+    data = generate_metadata(options["keys"], options["depth"], rng)
+    data.update(title="Record {0}".format(pid_value), recid=pid_value)
+    Record.create(data, id_=rec_uuid)
+    return pid
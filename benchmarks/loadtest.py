@@ -0,0 +1,428 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Load test the record views under increasing concurrency.
+
+Usage::
+
+    python benchmarks/loadtest.py --processes 2 --threads 8 \\
+        --concurrency 1,4,16,64 --output scaling.json
+    python benchmarks/loadtest.py --mix record=80,not_found=20 \\
+        --config RECORDS_UI_PID_CACHE=true --config RECORDS_UI_TOMBSTONE_CACHE=true
+
+The application is served by a local WSGI server, with ``--processes``
+forked worker processes of ``--threads`` threads each sharing one listening
+socket, from a file-based SQLite database of synthetic records. For each
+concurrency level, as many client threads replay the request mix for
+``--duration`` seconds. The results contain the throughput, the latency
+percentiles in milliseconds and the contention of the locks of the
+in-process caches. Forking requires a POSIX system.
+"""
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from bench_views import package_versions, parse_config, percentile, scenarios
+from fixtures import create_app, create_records
+from invenio_db import db
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+from invenio_records_ui.cache import LRUCache
+
+LOCKS = []
+"""Instrumented locks of the caches of the current process."""
+
+LOCK_STATS = 3
+"""Number of lock statistics per worker process in the shared array."""
+
+
+class ContendedLock(object):
+    """Reentrant lock counting how often and how long threads wait for it."""
+
+    def __init__(self):
+        """Initialize lock."""
+        self._lock = threading.RLock()
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait = 0.0
+
+    def acquire(self):
+        """Acquire the lock, measuring the wait if it is held elsewhere."""
+        if not self._lock.acquire(blocking=False):
+            start = time.perf_counter()
+            self._lock.acquire()
+            self.contended += 1
+            self.wait += time.perf_counter() - start
+        self.acquisitions += 1
+        return True
+
+    def release(self):
+        """Release the lock."""
+        self._lock.release()
+
+    def __enter__(self):
+        """Acquire the lock."""
+        return self.acquire()
+
+    def __exit__(self, *exc_info):
+        """Release the lock."""
+        self.release()
+
+
+class InstrumentedLRUCache(LRUCache):
+    """LRU cache with an instrumented lock, see ``RECORDS_UI_CACHE_BACKEND``."""
+
+    def __init__(self, *args, **kwargs):
+        """Initialize cache."""
+        super(InstrumentedLRUCache, self).__init__(*args, **kwargs)
+        self._lock = ContendedLock()
+        LOCKS.append(self._lock)
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """WSGI server handling requests in a fixed number of threads."""
+
+    multithread = True
+
+    def __init__(self, *args, **kwargs):
+        """Initialize server.
+
+        :param threads: Number of threads handling requests.
+        """
+        threads = kwargs.pop("threads")
+        super(PooledWSGIServer, self).__init__(*args, **kwargs)
+        self.pool = ThreadPoolExecutor(threads)
+
+    def process_request(self, request, client_address):
+        """Handle a request in a thread of the pool."""
+        self.pool.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        """Handle a request and close the connection."""
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    """Request handler which does not log requests."""
+
+    def log_request(self, *args, **kwargs):
+        """Do not log requests."""
+
+
+def serve(fd, database, config, threads, stats, slot):
+    """Serve the application in a worker process.
+
+    :param fd: File descriptor of the listening socket.
+    :param database: SQLAlchemy database URI.
+    :param config: Application configuration.
+    :param threads: Number of threads handling requests.
+    :param stats: Shared array of the lock statistics of the workers.
+    :param slot: Index of the worker in ``stats``.
+    """
+    del LOCKS[:]
+    config = dict(config, RECORDS_UI_CACHE_BACKEND=InstrumentedLRUCache)
+    app = create_app(database, config)
+    with socket.fromfd(fd, socket.AF_INET, socket.SOCK_STREAM) as listener:
+        host, port = listener.getsockname()
+    server = PooledWSGIServer(
+        host, port, app, handler=QuietRequestHandler, fd=fd, threads=threads
+    )
+
+    def publish():
+        while True:
+            locks = list(LOCKS)
+            offset = slot * LOCK_STATS
+            stats[offset] = sum(lock.acquisitions for lock in locks)
+            stats[offset + 1] = sum(lock.contended for lock in locks)
+            stats[offset + 2] = sum(lock.wait for lock in locks)
+            time.sleep(0.1)
+
+    threading.Thread(target=publish, daemon=True).start()
+    server.serve_forever()
+
+
+def lock_stats(stats):
+    """Sum the lock statistics of all workers.
+
+    :returns: Tuple (acquisitions, contended acquisitions, seconds waited).
+    """
+    values = list(stats)
+    return tuple(sum(values[i::LOCK_STATS]) for i in range(LOCK_STATS))
+
+
+def parse_mix(value):
+    """Parse a request mix like ``record=70,not_found=30``.
+
+    :returns: List of tuples (kind, weight).
+    """
+    mix = []
+    for item in value.split(","):
+        kind, dummy, weight = item.partition("=")
+        mix.append((kind.strip(), float(weight or 1)))
+    return mix
+
+
+def request_plan(pids, mix):
+    """Group the benchmark scenarios by kind of request.
+
+    :param pids: Persistent identifier values returned by
+        ``fixtures.create_records``.
+    :param mix: Request mix returned by :func:`parse_mix`.
+    :returns: Tuple (kinds, weights, requests by kind), where the requests
+        are tuples (URL, expected status code).
+    """
+    requests = {}
+    for name, urls, status in scenarios(pids):
+        kind = name.partition(":")[0]
+        requests.setdefault(kind, []).extend((url, status) for url in urls)
+    unknown = [kind for kind, dummy in mix if kind not in requests]
+    if unknown:
+        raise ValueError(
+            "Unknown request kinds {0}, use {1}.".format(
+                ", ".join(unknown), ", ".join(sorted(requests))
+            )
+        )
+    kinds = [kind for kind, dummy in mix]
+    weights = [weight for dummy, weight in mix]
+    return kinds, weights, requests
+
+
+def run_client(port, plan, deadline, seed):
+    """Send requests until the deadline.
+
+    :returns: List of tuples (kind, latency in seconds, whether the response
+        had the expected status).
+    """
+    kinds, weights, requests = plan
+    rng = random.Random(seed)
+    samples = []
+    while time.perf_counter() < deadline:
+        kind = rng.choices(kinds, weights)[0]
+        url, status = rng.choice(requests[kind])
+        start = time.perf_counter()
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            try:
+                conn.request("GET", url, headers={"Connection": "close"})
+                response = conn.getresponse()
+                response.read()
+                ok = response.status == status
+            finally:
+                conn.close()
+        except (OSError, http.client.HTTPException):
+            ok = False
+        samples.append((kind, time.perf_counter() - start, ok))
+    return samples
+
+
+def run_level(port, plan, concurrency, duration, stats, seed):
+    """Replay the request mix with a number of concurrent clients.
+
+    :returns: Dictionary of the statistics.
+    """
+    before = lock_stats(stats)
+    started = time.perf_counter()
+    deadline = started + duration
+    with ThreadPoolExecutor(concurrency) as executor:
+        futures = [
+            executor.submit(run_client, port, plan, deadline, seed + i)
+            for i in range(concurrency)
+        ]
+        samples = [sample for future in futures for sample in future.result()]
+    elapsed = time.perf_counter() - started
+    time.sleep(0.3)
+    after = lock_stats(stats)
+
+    acquisitions, contended, wait = (a - b for a, b in zip(after, before))
+    milliseconds = sorted(latency * 1000 for dummy, latency, dummy_ok in samples)
+    by_kind = {}
+    for kind, latency, ok in samples:
+        entry = by_kind.setdefault(kind, dict(requests=0, errors=0))
+        entry["requests"] += 1
+        entry["errors"] += 0 if ok else 1
+    return dict(
+        concurrency=concurrency,
+        requests=len(samples),
+        errors=sum(1 for dummy, dummy_latency, ok in samples if not ok),
+        throughput=len(samples) / elapsed,
+        p50_ms=percentile(milliseconds, 0.5) if samples else None,
+        p95_ms=percentile(milliseconds, 0.95) if samples else None,
+        p99_ms=percentile(milliseconds, 0.99) if samples else None,
+        max_ms=milliseconds[-1] if samples else None,
+        kinds=by_kind,
+        locks=dict(
+            acquisitions=int(acquisitions),
+            contended=int(contended),
+            contention=contended / acquisitions if acquisitions else 0.0,
+            wait_ms=wait * 1000,
+        ),
+    )
+
+
+def wait_until_ready(port, url, timeout=60):
+    """Wait until the server answers requests."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            try:
+                conn.request("GET", url)
+                conn.getresponse().read()
+                return
+            finally:
+                conn.close()
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def main(argv=None):
+    """Run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--database",
+        help="Path of the SQLite database. (Default: a temporary file)",
+    )
+    parser.add_argument(
+        "--records", type=int, default=50, help="Records per grade and state."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the records.")
+    parser.add_argument(
+        "--processes", type=int, default=1, help="Server worker processes."
+    )
+    parser.add_argument(
+        "--threads", type=int, default=8, help="Threads per worker process."
+    )
+    parser.add_argument(
+        "--concurrency",
+        default="1,2,4,8,16,32",
+        help="Comma-separated numbers of concurrent clients.",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=10, help="Seconds per concurrency level."
+    )
+    parser.add_argument(
+        "--mix",
+        default="record=70,export=10,redirect=5,tombstone=5,not_found=10",
+        help="Weights of the kinds of requests.",
+    )
+    parser.add_argument(
+        "--config",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Application configuration, e.g. RECORDS_UI_PID_CACHE=true.",
+    )
+    parser.add_argument("--output", help="Write the results to a file.")
+    args = parser.parse_args(argv)
+
+    tmpdir = None
+    if args.database:
+        path = os.path.abspath(args.database)
+    else:
+        tmpdir = tempfile.mkdtemp(prefix="records-ui-loadtest-")
+        path = os.path.join(tmpdir, "records.db")
+    database = "sqlite:///{0}".format(path)
+    config = parse_config(args.config)
+    levels = [int(value) for value in args.concurrency.split(",")]
+
+    app = create_app(database, config)
+    pids = create_records(app, records=args.records, seed=args.seed)
+    plan = request_plan(pids, parse_mix(args.mix))
+    with app.app_context():
+        db.engine.dispose()
+
+    context = multiprocessing.get_context("fork")
+    stats = context.Array("d", args.processes * LOCK_STATS, lock=False)
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1024)
+    port = listener.getsockname()[1]
+    workers = [
+        context.Process(
+            target=serve,
+            args=(listener.fileno(), database, config, args.threads, stats, slot),
+            daemon=True,
+        )
+        for slot in range(args.processes)
+    ]
+    results = []
+    try:
+        for worker in workers:
+            worker.start()
+        wait_until_ready(port, plan[2]["record"][0][0])
+
+        for concurrency in levels:
+            result = run_level(port, plan, concurrency, args.duration, stats, args.seed)
+            results.append(result)
+            print(
+                "{0:>4} clients  {1:9.1f} req/s  p50 {2:8.3f} ms  p95 {3:8.3f} ms"
+                "  p99 {4:8.3f} ms  errors {5}  lock contention {6:.2%}".format(
+                    concurrency,
+                    result["throughput"],
+                    result["p50_ms"] or 0,
+                    result["p95_ms"] or 0,
+                    result["p99_ms"] or 0,
+                    result["errors"],
+                    result["locks"]["contention"],
+                ),
+                file=sys.stderr,
+            )
+    finally:
+        for worker in workers:
+            worker.terminate()
+            worker.join()
+        listener.close()
+        if tmpdir:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    output = dict(
+        created=datetime.now(timezone.utc).isoformat(),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        cpus=os.cpu_count(),
+        packages=package_versions(),
+        options=dict(
+            records=args.records,
+            seed=args.seed,
+            processes=args.processes,
+            threads=args.threads,
+            duration=args.duration,
+            mix=args.mix,
+            config=args.config,
+        ),
+        results=results,
+    )
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(output, fp, indent=2, sort_keys=True)
+    else:
+        json.dump(output, sys.stdout, indent=2, sort_keys=True)
+        print()
+    return 1 if any(result["errors"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
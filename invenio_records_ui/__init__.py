@@ -235,6 +235,11 @@ Viewed record 1
 >>> res.status_code
 200
 
+Receivers run while the page is rendered. Set ``RECORDS_UI_ASYNC_SIGNALS`` to
+deliver the signal from worker threads instead; receivers then only get an
+application context, so the current request and ``current_user`` are not
+available, and must read the request snapshot from ``flask.g.record_view``.
+
 Access control
 --------------
 Invenio-Records-UI is integrated with Flask-Principal to provide access control
@@ -0,0 +1,226 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Export artifacts precomputed when records are committed.
+
+The output of the export formats of a record is generated in the background
+once a transaction changing the record is committed, and stored tagged with
+the record revision. The export views serve the stored output as long as
+its revision matches the record, and serialize the record otherwise.
+"""
+
+from __future__ import absolute_import, print_function
+
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import six
+from invenio_pidstore.models import PersistentIdentifier
+from sqlalchemy.orm.exc import NoResultFound
+
+from .utils import obj_or_import_string
+
+
+def _path_segment(value):
+    """Quote a value to be used as a file name."""
+    return quote(six.text_type(value), safe="").replace(".", "%2E")
+
+
+class FilesystemArtifactStore(object):
+    """Store of export artifacts in a directory.
+
+    Each artifact is stored in ``<path>/<pid_type>/<pid_value>/<slug>.<rev>``,
+    and replaces the artifacts of older revisions. Any object providing the
+    same ``get``, ``set`` and ``delete`` methods can be used as a store via
+    ``RECORDS_UI_EXPORT_ARTIFACTS_STORE``.
+    """
+
+    def __init__(self, path):
+        """Initialize store.
+
+        :param path: Directory of the artifacts.
+        """
+        self.path = path
+
+    def _directory(self, pid_type, pid_value):
+        """Get the directory of the artifacts of a persistent identifier."""
+        return os.path.join(
+            self.path, _path_segment(pid_type), _path_segment(pid_value)
+        )
+
+    def get(self, pid_type, pid_value, slug, revision_id):
+        """Get an artifact.
+
+        :param pid_type: Persistent identifier type.
+        :param pid_value: Persistent identifier value.
+        :param slug: Export format slug.
+        :param revision_id: Record revision.
+        :returns: The serialized record as text, or ``None`` if there is no
+            artifact for the revision.
+        """
+        filename = os.path.join(
+            self._directory(pid_type, pid_value),
+            "{0}.{1}".format(_path_segment(slug), revision_id),
+        )
+        try:
+            with open(filename, encoding="utf8") as fp:
+                return fp.read()
+        except (IOError, OSError):
+            return None
+
+    def set(self, pid_type, pid_value, slug, revision_id, data):
+        """Store an artifact, replacing the ones of other revisions.
+
+        :param pid_type: Persistent identifier type.
+        :param pid_value: Persistent identifier value.
+        :param slug: Export format slug.
+        :param revision_id: Record revision.
+        :param data: The serialized record as text.
+        """
+        directory = self._directory(pid_type, pid_value)
+        os.makedirs(directory, exist_ok=True)
+        prefix = "{0}.".format(_path_segment(slug))
+        name = "{0}{1}".format(prefix, revision_id)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf8") as fp:
+                fp.write(data)
+            os.replace(tmp, os.path.join(directory, name))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        for other in os.listdir(directory):
+            if other.startswith(prefix) and other != name:
+                try:
+                    os.unlink(os.path.join(directory, other))
+                except (IOError, OSError):
+                    pass
+
+    def delete(self, pid_type, pid_value):
+        """Delete all artifacts of a persistent identifier.
+
+        :param pid_type: Persistent identifier type.
+        :param pid_value: Persistent identifier value.
+        """
+        directory = self._directory(pid_type, pid_value)
+        try:
+            names = os.listdir(directory)
+        except (IOError, OSError):
+            return
+        for name in names:
+            try:
+                os.unlink(os.path.join(directory, name))
+            except (IOError, OSError):
+                pass
+
+
+def filesystem_store(app):
+    """Create the filesystem store of an application.
+
+    :param app: The Flask application.
+    :returns: A :class:`FilesystemArtifactStore` in
+        ``RECORDS_UI_EXPORT_ARTIFACTS_PATH``.
+    """
+    path = app.config["RECORDS_UI_EXPORT_ARTIFACTS_PATH"] or os.path.join(
+        app.instance_path, "export-artifacts"
+    )
+    return FilesystemArtifactStore(path)
+
+
+class ArtifactGenerator(object):
+    """Generate the export artifacts of records in a pool of worker threads.
+
+    Each record is loaded in a new application context, so that generation
+    can be scheduled once the changes of a transaction are committed.
+    """
+
+    def __init__(self, app, store, workers=2):
+        """Initialize generator.
+
+        :param app: The Flask application.
+        :param store: Store of the artifacts.
+        :param workers: Number of worker threads. If ``0``, artifacts are
+            generated when scheduled.
+        """
+        self.app = app
+        self.store = store
+        self.workers = workers
+        self.generated = 0
+        self.failed = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def schedule(self, record_class, record_id):
+        """Schedule the generation of the artifacts of a record.
+
+        :param record_class: Record API class.
+        :param record_id: Record identifier.
+        """
+        if not self.workers:
+            self.generate(record_class, record_id)
+            return
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        self.workers, thread_name_prefix="records-ui-artifacts"
+                    )
+        self._executor.submit(self.generate, record_class, record_id)
+
+    def shutdown(self, wait=True):
+        """Stop the worker threads.
+
+        :param wait: Wait until the scheduled artifacts are generated.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def generate(self, record_class, record_id):
+        """Generate the artifacts of a record for all its export formats.
+
+        The artifacts of the persistent identifiers of a deleted record are
+        deleted instead.
+
+        :param record_class: Record API class.
+        :param record_id: Record identifier.
+        """
+        try:
+            with self.app.app_context():
+                self._generate(record_class, record_id)
+            with self._lock:
+                self.generated += 1
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            self.app.logger.exception(
+                "Failed to generate export artifacts of record {0}.".format(record_id)
+            )
+
+    def _generate(self, record_class, record_id):
+        """Generate the artifacts of a record in an application context."""
+        pids = PersistentIdentifier.query.filter_by(
+            object_type="rec", object_uuid=record_id
+        ).all()
+        try:
+            record = record_class.get_record(record_id)
+        except NoResultFound:
+            record = None
+
+        state = self.app.extensions["invenio-records-ui"]
+        for pid in pids:
+            if record is None or not pid.is_registered():
+                self.store.delete(pid.pid_type, pid.pid_value)
+                continue
+            for slug, fmt in state.export_formats(pid.pid_type):
+                serializer = obj_or_import_string(fmt["serializer"])
+                data = serializer.serialize(pid, record)
+                if isinstance(data, six.binary_type):
+                    data = data.decode("utf8")
+                self.store.set(
+                    pid.pid_type, pid.pid_value, slug, record.revision_id, data
+                )
@@ -0,0 +1,201 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Bulk export of records in an export format."""
+
+from __future__ import absolute_import, print_function
+
+import re
+import zipfile
+
+import six
+from invenio_db import db
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus
+from invenio_records.api import Record
+from sqlalchemy import and_, func, or_
+from werkzeug.utils import secure_filename
+
+XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>\s*")
+"""XML declaration of a serialized record, dropped in multi-record XML."""
+
+
+def iter_records(
+    pid_type,
+    pid_values=None,
+    start=None,
+    end=None,
+    record_class=Record,
+    batch_size=500,
+):
+    """Iterate over registered persistent identifiers and their records.
+
+    The persistent identifiers and records are fetched together, in batches
+    of ``batch_size`` rows (from a server-side cursor where the database
+    supports it), so that memory use does not grow with the number of
+    records. Persistent identifiers which are not registered or whose record
+    is deleted are skipped.
+
+    :param pid_type: Persistent identifier type.
+    :param pid_values: Persistent identifier values. (Default: all)
+    :param start: Smallest persistent identifier value, if ``pid_values`` is
+        not given. Values are ordered by length, then alphabetically, so that
+        numeric values are in numeric order.
+    :param end: Largest persistent identifier value, see ``start``.
+    :param record_class: Record API class.
+    :param batch_size: Number of rows fetched at once.
+    :returns: Iterator of tuples (pid, record).
+    """
+    model_cls = record_class.model_cls
+    query = (
+        db.session.query(PersistentIdentifier, model_cls)
+        .join(
+            model_cls,
+            and_(
+                PersistentIdentifier.object_type == "rec",
+                model_cls.id == PersistentIdentifier.object_uuid,
+            ),
+        )
+        .filter(
+            PersistentIdentifier.pid_type == pid_type,
+            PersistentIdentifier.status == PIDStatus.REGISTERED,
+            model_cls.is_deleted != True,  # noqa
+        )
+    )
+
+    if pid_values is not None:
+        values = [six.text_type(value) for value in pid_values]
+        for offset in range(0, len(values), batch_size):
+            batch = values[offset : offset + batch_size]
+            rows = {
+                pid.pid_value: (pid, model)
+                for pid, model in query.filter(
+                    PersistentIdentifier.pid_value.in_(batch)
+                )
+            }
+            for value in batch:
+                if value in rows:
+                    pid, model = rows.pop(value)
+                    yield pid, record_class(model.data, model=model)
+        return
+
+    length = func.length(PersistentIdentifier.pid_value)
+    if start is not None:
+        query = query.filter(
+            or_(
+                length > len(start),
+                and_(length == len(start), PersistentIdentifier.pid_value >= start),
+            )
+        )
+    if end is not None:
+        query = query.filter(
+            or_(
+                length < len(end),
+                and_(length == len(end), PersistentIdentifier.pid_value <= end),
+            )
+        )
+    query = query.order_by(length, PersistentIdentifier.pid_value)
+    for pid, model in query.yield_per(batch_size):
+        yield pid, record_class(model.data, model=model)
+
+
+def ndjson_stream(items):
+    """Concatenate JSON documents as newline-delimited JSON.
+
+    :param items: Iterable of tuples (pid, serialized record as text).
+    :returns: Iterator of text chunks.
+    """
+    for dummy_pid, data in items:
+        # Raw line breaks can only be whitespace in JSON.
+        yield data.strip().replace("\r", " ").replace("\n", " ") + "\n"
+
+
+def xml_stream(items, root="records"):
+    """Concatenate XML documents below a common root element.
+
+    :param items: Iterable of tuples (pid, serialized record as text).
+    :param root: Name of the root element.
+    :returns: Iterator of text chunks.
+    """
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<{0}>\n'.format(root)
+    for dummy_pid, data in items:
+        yield XML_DECLARATION.sub("", data).strip() + "\n"
+    yield "</{0}>\n".format(root)
+
+
+class _ZipOutput(object):
+    """Unseekable file object collecting the output of a zip file."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        del self.chunks[:]
+        return data
+
+
+def zip_stream(items, extension):
+    """Stream a zip file with one file per record.
+
+    :param items: Iterable of tuples (pid, serialized record as text).
+    :param extension: File name extension of the records.
+    :returns: Iterator of byte chunks.
+    """
+    output = _ZipOutput()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+        for pid, data in items:
+            archive.writestr(
+                "{0}.{1}".format(secure_filename(pid.pid_value), extension),
+                data.encode("utf8"),
+            )
+            chunk = output.drain()
+            if chunk:
+                yield chunk
+    yield output.drain()
+
+
+def default_container(fmt):
+    """Get the container used by default for an export format.
+
+    :param fmt: Export format options from ``RECORDS_UI_EXPORT_FORMATS``.
+    :returns: ``ndjson`` for JSON, ``xml`` for XML and ``zip`` for any other
+        ``mimetype``.
+    """
+    mimetype = fmt.get("mimetype", "")
+    if mimetype == "application/json" or mimetype.endswith("+json"):
+        return "ndjson"
+    if mimetype.endswith("/xml") or mimetype.endswith("+xml"):
+        return "xml"
+    return "zip"
+
+
+def export_stream(items, slug, fmt, container=None):
+    """Stream serialized records in a container.
+
+    :param items: Iterable of tuples (pid, serialized record as text).
+    :param slug: Export format slug.
+    :param fmt: Export format options from ``RECORDS_UI_EXPORT_FORMATS``.
+    :param container: ``ndjson``, ``xml`` or ``zip``.
+        (Default: :func:`default_container`)
+    :returns: Tuple (iterator of chunks, mimetype, file name extension).
+    :raises ValueError: If the container is unknown.
+    """
+    container = container or default_container(fmt)
+    if container == "ndjson":
+        return ndjson_stream(items), "application/x-ndjson", "ndjson"
+    if container == "xml":
+        return xml_stream(items), "application/xml", "xml"
+    if container == "zip":
+        return (
+            zip_stream(items, fmt.get("extension", slug)),
+            "application/zip",
+            "zip",
+        )
+    raise ValueError("Unknown container {0}.".format(container))
@@ -0,0 +1,116 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""In-process caches used by the record views."""
+
+from __future__ import absolute_import, print_function
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """Thread-safe, size-bounded least-recently-used cache.
+
+    Entries may expire after a timeout and may be tagged, so that all entries
+    sharing a tag (e.g. all pages rendered for one record) can be dropped at
+    once. Any object providing the same ``get``, ``set``, ``delete``,
+    ``invalidate`` and ``clear`` methods can be used as a cache backend via
+    ``RECORDS_UI_CACHE_BACKEND``.
+    """
+
+    def __init__(self, maxsize=1024, timeout=None):
+        """Initialize cache.
+
+        :param maxsize: Maximum number of entries kept in the cache.
+        :param timeout: Default number of seconds after which entries expire.
+            If ``None`` entries never expire. (Default: ``None``)
+        """
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        """Get a value from the cache.
+
+        :param key: Cache key.
+        :param default: Value returned if the key is missing or expired.
+        :returns: The cached value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires, dummy_tags = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._remove(key)
+            self.misses += 1
+            return default
+
+    def set(self, key, value, timeout=None, tags=None):
+        """Store a value in the cache.
+
+        :param key: Cache key.
+        :param value: Value to store.
+        :param timeout: Number of seconds after which the entry expires.
+            (Default: the cache timeout)
+        :param tags: Iterable of tags the entry can be invalidated by.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        expires = time.monotonic() + timeout if timeout else None
+        tags = frozenset(tags or ())
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key):
+        """Remove a value from the cache.
+
+        :param key: Cache key.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate(self, tag):
+        """Remove all values tagged with a given tag.
+
+        :param tag: Tag given when storing the values.
+        """
+        with self._lock:
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+
+    def clear(self):
+        """Remove all values from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self):
+        """Get number of entries in the cache."""
+        return len(self._entries)
+
+    def _remove(self, key):
+        """Remove an entry and its tag references."""
+        dummy_value, dummy_expires, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
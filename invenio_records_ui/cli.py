@@ -0,0 +1,168 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Command line interface for Invenio-Records-UI."""
+
+from __future__ import absolute_import, print_function
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from invenio_records.api import Record
+
+from .bulk import export_stream, iter_records
+from .ext import init_bytecode_cache
+from .utils import obj_or_import_string
+from .views import record_view_options, serialize_record
+
+
+@click.group(name="records-ui")
+def records_ui():
+    """Records UI management commands."""
+
+
+@records_ui.command()
+@with_appcontext
+def warmup():
+    """Compile the templates of the configured endpoints."""
+    init_bytecode_cache(current_app)
+    state = current_app.extensions["invenio-records-ui"]
+    for name in state.warmup_templates():
+        click.echo(name)
+
+
+def endpoint_errors(app):
+    """Import and validate the configured endpoints and export formats.
+
+    :param app: The Flask application.
+    :returns: List of error messages.
+    """
+    errors = []
+    try:
+        obj_or_import_string(app.config["RECORDS_UI_DEFAULT_PERMISSION_FACTORY"])
+    except Exception as e:
+        errors.append("RECORDS_UI_DEFAULT_PERMISSION_FACTORY: {0}".format(e))
+
+    for endpoint, options in (app.config.get("RECORDS_UI_ENDPOINTS") or {}).items():
+        options = dict(options)
+        route = options.pop("route", None) or ""
+        options.pop("methods", None)
+        options.pop("lazy", None)
+        if "pid_value>" not in route:
+            errors.append("{0}: route must include <pid_value>.".format(endpoint))
+        if not options.get("pid_type"):
+            errors.append("{0}: pid_type is required.".format(endpoint))
+            continue
+        try:
+            view_options = record_view_options(**options)
+            app.jinja_env.get_template(view_options["template"])
+        except Exception as e:
+            errors.append("{0}: {1!r}".format(endpoint, e))
+
+    formats = app.config.get("RECORDS_UI_EXPORT_FORMATS") or {}
+    for pid_type, pid_type_formats in formats.items():
+        for slug, fmt in pid_type_formats.items():
+            if not fmt:
+                continue
+            try:
+                obj_or_import_string(fmt["serializer"])
+                fmt["title"], fmt["order"]
+            except Exception as e:
+                errors.append("{0} format {1}: {2!r}".format(pid_type, slug, e))
+    return errors
+
+
+@records_ui.command()
+@with_appcontext
+def check():
+    """Import and validate the configured endpoints."""
+    errors = endpoint_errors(current_app)
+    for error in errors:
+        click.secho(error, fg="red", err=True)
+    if errors:
+        raise click.exceptions.Exit(1)
+    click.echo("OK")
+
+
+@records_ui.command()
+@click.argument("pid_types", metavar="[PID_TYPE]...", nargs=-1)
+@click.option("--record-class", help="Import path of the record API class.")
+@with_appcontext
+def artifacts(pid_types, record_class):
+    """Generate the export artifacts of existing records.
+
+    Generates the artifacts of all registered persistent identifiers of the
+    given types, or of all types with export formats.
+    """
+    generator = current_app.extensions["invenio-records-ui"].export_artifacts
+    if generator is None:
+        raise click.UsageError("RECORDS_UI_EXPORT_ARTIFACTS is off.")
+    record_class = obj_or_import_string(record_class, default=Record)
+    formats = current_app.config.get("RECORDS_UI_EXPORT_FORMATS") or {}
+    for pid_type in pid_types or sorted(formats):
+        count = 0
+        for dummy_pid, record in iter_records(pid_type, record_class=record_class):
+            generator.generate(record_class, record.id)
+            count += 1
+        click.echo("{0}: {1}".format(pid_type, count))
+
+
+@records_ui.command("export")
+@click.argument("pid_type")
+@click.argument("slug", metavar="FORMAT")
+@click.option(
+    "--pid-value",
+    "pid_values",
+    multiple=True,
+    help="Persistent identifier value to export. Can be repeated.",
+)
+@click.option("--start", help="Smallest persistent identifier value.")
+@click.option("--end", help="Largest persistent identifier value.")
+@click.option(
+    "--container",
+    type=click.Choice(["ndjson", "xml", "zip"]),
+    help="How the records are concatenated. (Default: based on the mimetype)",
+)
+@click.option("--record-class", help="Import path of the record API class.")
+@click.option(
+    "--batch-size",
+    type=int,
+    default=500,
+    show_default=True,
+    help="Number of records fetched at once.",
+)
+@click.option("-o", "--output", type=click.File("wb"), default="-", help="Output file.")
+@with_appcontext
+def export(
+    pid_type, slug, pid_values, start, end, container, record_class, batch_size, output
+):
+    """Export records of PID_TYPE in an export FORMAT.
+
+    Exports the given or else all registered persistent identifiers, without
+    checking permissions.
+    """
+    formats = current_app.config.get("RECORDS_UI_EXPORT_FORMATS", {})
+    fmt = formats.get(pid_type, {}).get(slug)
+    if not fmt:
+        raise click.BadParameter(
+            "Unknown or deprecated format {0} of {1}.".format(slug, pid_type),
+            param_hint="FORMAT",
+        )
+    records = iter_records(
+        pid_type,
+        pid_values=pid_values or None,
+        start=start,
+        end=end,
+        record_class=obj_or_import_string(record_class, default=Record),
+        batch_size=batch_size,
+    )
+    chunks, dummy_mimetype, dummy_extension = export_stream(
+        ((pid, serialize_record(pid, record, slug, fmt)) for pid, record in records),
+        slug,
+        fmt,
+        container,
+    )
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf8")
+        output.write(chunk)
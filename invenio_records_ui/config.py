@@ -8,12 +8,36 @@ from __future__ import absolute_import, print_function
 RECORDS_UI_TOMBSTONE_TEMPLATE = "invenio_records_ui/tombstone.html"
 """Configure the tombstone template."""
 
+RECORDS_UI_TOMBSTONE_CACHE_CONTROL = None
+"""Value of the ``Cache-Control`` header of tombstones.
+
+E.g. ``"public, max-age=86400"`` lets browsers and proxies cache tombstones
+of deleted records for a day. (Default: ``None``, no header is sent)
+"""
+
+RECORDS_UI_TOMBSTONE_LOAD_RECORD = True
+"""Load the record of deleted persistent identifiers.
+
+Set to ``False`` if the tombstone template does not display the record, to
+avoid fetching it. The template then receives an empty record. Only honoured
+by :class:`invenio_records_ui.resolver.RecordResolver`.
+"""
+
 RECORDS_UI_DEFAULT_PERMISSION_FACTORY = None
 """Configure the default permission factory."""
 
 RECORDS_UI_LOGIN_ENDPOINT = "security.login"
 """Endpoint where redirect the user if login is required."""
 
+RECORDS_UI_REDIRECT_CODE = 302
+"""HTTP status code used to redirect a redirected persistent identifier.
+
+Chains of redirected persistent identifiers are always collapsed into a
+single redirect to the final persistent identifier. Use ``301`` if
+redirections are permanent (e.g. merged records), so that browsers and
+caches can remember them.
+"""
+
 RECORDS_UI_ENDPOINTS = {
     "recid": {
         "pid_type": "recid",
@@ -26,6 +50,16 @@ RECORDS_UI_ENDPOINTS = {
         "view_imp": "invenio_records_ui.views.export",
         "template": "invenio_records_ui/export.html",
     },
+    "recid_export_raw": {
+        "pid_type": "recid",
+        "route": "/records/<pid_value>/export/<format>/raw",
+        "view_imp": "invenio_records_ui.views.export_raw",
+    },
+    "recid_fragment": {
+        "pid_type": "recid",
+        "route": "/records/<pid_value>/fragment",
+        "view_imp": "invenio_records_ui.views.fragment",
+    },
 }
 """Default UI endpoints.
 
@@ -58,6 +92,10 @@ The structure of the dictionary is as follows:
             "view_imp": my_view,
             "record_class": "invenio_records.api:Record",
             "methods": ["GET", "POST", "PUT", "DELETE"],
+            "page_cache": False,
+            "conditional": False,
+            "resolver_imp": "invenio_records_ui.resolver:RecordResolver",
+            "lazy": False,
         },
         ...
     }
@@ -79,6 +117,146 @@ The structure of the dictionary is as follows:
     (Default: ``invenio_records.api:Record``)
 
 :param methods: List of methods supported. (Default: ``['GET']``)
+
+:param page_cache: Cache the HTML rendered by the default view method per
+    record revision. See ``RECORDS_UI_PAGE_CACHE_SIZE``.
+    (Default: ``False``)
+
+:param conditional: Send ``ETag`` and ``Last-Modified`` headers derived from
+    the record revision, and answer ``If-None-Match``/``If-Modified-Since``
+    requests with ``304 Not Modified`` without calling the view.
+    (Default: ``False``)
+
+:param resolver_imp: Import path to the persistent identifier resolver class.
+    Use :class:`invenio_records_ui.resolver.RecordResolver` to resolve the
+    persistent identifier, its redirection and the record in a single
+    database query. (Default: ``invenio_pidstore.resolver:Resolver``)
+
+:param negotiate: Answer requests whose ``Accept`` header prefers the
+    ``mimetype`` of an export format of ``RECORDS_UI_EXPORT_FORMATS`` over
+    HTML with the record serialized in that format, without rendering the
+    page or sending the ``record_viewed`` signal. Responses of the endpoint
+    then carry ``Vary: Accept``. (Default: ``True`` if ``view_imp`` is not
+    set, ``False`` otherwise)
+
+:param lazy: Import the view, permission factory, record and resolver classes
+    on the first request to the endpoint instead of when the blueprint is
+    created. (Default: ``RECORDS_UI_LAZY_ENDPOINTS``)
+"""
+
+RECORDS_UI_LAZY_ENDPOINTS = False
+"""Import the objects configured for the endpoints on their first request.
+
+Speeds up the startup of processes not serving the record pages, such as
+command line and Celery workers. As errors in ``RECORDS_UI_ENDPOINTS`` then
+only show on the first request, check the configuration with
+``flask records-ui check``, e.g. in continuous integration.
+"""
+
+RECORDS_UI_BATCH_ENDPOINTS = {}
+"""Endpoints displaying several records of one persistent identifier type.
+
+The persistent identifiers, their redirections and the records are fetched
+with one database query, e.g. for collection pages or related records
+widgets. The persistent identifier values are passed in the ``pid_value``
+query argument, repeated or comma-separated, e.g.
+``/records/batch?pid_value=1,2,3``. Permissions are checked per record.
+
+By default a page with all viewable records is rendered. With
+``format=json``, a JSON envelope is returned with one entry per persistent
+identifier value, containing its ``status`` (e.g. ``200``, ``404`` or
+``410``), the rendered ``html`` of viewable records, and the ``location`` of
+redirected persistent identifiers:
+
+.. code-block:: json
+
+    {"hits": [
+        {"pid_value": "1", "status": 200, "html": "..."},
+        {"pid_value": "2", "status": 410}
+    ]}
+
+Example:
+
+.. code-block:: python
+
+    RECORDS_UI_BATCH_ENDPOINTS = dict(
+        recid_batch=dict(
+            pid_type="recid",
+            route="/records/batch",
+            template="invenio_records_ui/batch.html",
+            item_template="invenio_records_ui/batch_item.html",
+            permission_factory_imp="...",
+            record_class="invenio_records.api:Record",
+            max_size=100,
+        ),
+    )
+
+:param pid_type: Persistent identifier type of the records. Required.
+
+:param route: URL route. Required.
+
+:param template: Template of the page with all records.
+    (Default: ``invenio_records_ui/batch.html``)
+
+:param item_template: Template rendering one record, with ``pid`` and
+    ``record`` in the context. (Default: ``invenio_records_ui/batch_item.html``)
+
+:param permission_factory_imp: Import path to factory that creates a read
+    permission object for a given record. (Default:
+    ``RECORDS_UI_DEFAULT_PERMISSION_FACTORY``)
+
+:param record_class: Import path of the record API class. Overrides of its
+    ``get_record`` method are bypassed.
+    (Default: ``invenio_records.api:Record``)
+
+:param max_size: Maximum number of persistent identifier values per request.
+    (Default: ``100``)
+"""
+
+RECORDS_UI_BULK_EXPORT_ENDPOINTS = {}
+"""Endpoints streaming many records in one export format.
+
+The URL route must include a ``<format>`` pattern, the slug of a format of
+``RECORDS_UI_EXPORT_FORMATS``. The records are selected by the ``pid_value``
+query argument, repeated or comma-separated, or else by the ``start`` and
+``end`` persistent identifier values (default: all records), e.g.
+``/records/export/json?start=1&end=1000``. Records are fetched in batches
+and serialized one at a time, and records the user may not view are left
+out.
+
+The ``container`` query argument selects how the records are concatenated:
+``ndjson`` (one JSON document per line), ``xml`` (below a ``records`` root
+element) or ``zip`` (one file per record). It defaults to ``ndjson`` for
+formats with a JSON ``mimetype``, ``xml`` for XML and ``zip`` otherwise.
+Records can also be exported with ``flask records-ui export``.
+
+Example:
+
+.. code-block:: python
+
+    RECORDS_UI_BULK_EXPORT_ENDPOINTS = dict(
+        recid_bulk_export=dict(
+            pid_type="recid",
+            route="/records/export/<format>",
+            permission_factory_imp="...",
+            record_class="invenio_records.api:Record",
+            batch_size=500,
+        ),
+    )
+
+:param pid_type: Persistent identifier type of the records. Required.
+
+:param route: URL route, including ``<format>``. Required.
+
+:param permission_factory_imp: Import path to factory that creates a read
+    permission object for a given record. (Default:
+    ``RECORDS_UI_DEFAULT_PERMISSION_FACTORY``)
+
+:param record_class: Import path of the record API class.
+    (Default: ``invenio_records.api:Record``)
+
+:param batch_size: Number of records fetched from the database at once.
+    (Default: ``500``)
 """
 
 RECORDS_UI_EXPORT_FORMATS = {}
@@ -94,9 +272,280 @@ The structure of the dictionary is as follows:
                 "title": "<export format title>",
                 "serializer": "<object or import path to record serializer>",
                 "order": 1,
+                "mimetype": "application/json",
+                "extension": "json",
+                "cache": {"maxsize": 256, "timeout": 3600},
             },
             ...
         },
         ...
     }
+
+The optional ``mimetype`` and ``extension`` keys are used by the raw
+download view (:func:`invenio_records_ui.views.export_raw`), which sends the
+serialized record as a file instead of embedding it in an HTML page.
+(Default: ``application/octet-stream`` and the format slug)
+
+The optional ``cache`` key enables caching of the serializer output per
+record revision. It is either ``True`` or a dictionary with the maximum
+number of cached records (``maxsize``, default ``256``) and the number of
+seconds after which entries expire (``timeout``, default ``None``). Cached
+output is dropped when the record is updated, deleted or reverted.
+
+Formats with a ``mimetype`` can also be requested from the record endpoints
+through the ``Accept`` header (see the ``negotiate`` option of
+``RECORDS_UI_ENDPOINTS``).
 """
+
+RECORDS_UI_EXPORT_ARTIFACTS = False
+"""Precompute the output of the export formats when records are committed.
+
+Once a transaction inserting, updating or reverting a record is committed,
+the record is serialized in all export formats of its persistent identifiers
+in the background, and the output is stored with the record revision. The
+export views serve the stored output while its revision matches the record,
+and serialize the record otherwise. Use ``flask records-ui artifacts`` to
+generate the artifacts of existing records.
+"""
+
+RECORDS_UI_EXPORT_ARTIFACTS_STORE = "invenio_records_ui.artifacts:filesystem_store"
+"""Factory of the store of the export artifacts, called with the application.
+
+See :class:`invenio_records_ui.artifacts.FilesystemArtifactStore` for the
+interface of stores.
+"""
+
+RECORDS_UI_EXPORT_ARTIFACTS_PATH = None
+"""Directory of the filesystem store of export artifacts.
+
+It must be shared by all processes serving the application.
+(Default: ``export-artifacts`` in the instance path)
+"""
+
+RECORDS_UI_EXPORT_ARTIFACTS_WORKERS = 2
+"""Number of threads generating export artifacts per process.
+
+If ``0``, artifacts are generated synchronously once the transaction is
+committed.
+"""
+
+RECORDS_UI_CACHE_BACKEND = "invenio_records_ui.cache:LRUCache"
+"""Cache backend factory.
+
+Import path or callable that is called with the keyword arguments ``maxsize``
+and ``timeout`` and must return an object implementing the interface of
+:class:`invenio_records_ui.cache.LRUCache`.
+"""
+
+RECORDS_UI_PAGE_CACHE_SIZE = 1024
+"""Maximum number of rendered pages kept by the page cache.
+
+The page cache is enabled per endpoint with the ``page_cache`` option in
+``RECORDS_UI_ENDPOINTS``. Pages are cached per endpoint, persistent
+identifier, record revision, template and locale, and are dropped when the
+record is updated, deleted or reverted.
+
+Only pages rendered for anonymous users without pending flashed messages are
+cached and served from the cache. Other than that, a cached template must not
+vary per user or request (e.g. show CSRF tokens or query arguments).
+"""
+
+RECORDS_UI_PAGE_CACHE_TIMEOUT = None
+"""Number of seconds after which a cached page expires (``None`` to never)."""
+
+RECORDS_UI_PID_CACHE = False
+"""Cache resolved persistent identifiers in memory.
+
+Registered persistent identifiers are cached per process, so that only the
+record needs to be fetched when displaying it. Entries are dropped when the
+persistent identifier is changed (e.g. deleted or redirected) in this
+process, when its record is updated, or explicitly with
+:meth:`invenio_records_ui.ext._RecordUIState.invalidate_pid`. Other processes
+only see changes once their entries expire, see
+``RECORDS_UI_PID_CACHE_TIMEOUT``.
+"""
+
+RECORDS_UI_PID_CACHE_SIZE = 10000
+"""Maximum number of persistent identifiers kept in the PID cache."""
+
+RECORDS_UI_PID_CACHE_TIMEOUT = 300
+"""Number of seconds after which a cached persistent identifier expires."""
+
+RECORDS_UI_NEGATIVE_CACHE = False
+"""Cache lookups of persistent identifiers which do not exist.
+
+Requests for unknown persistent identifiers (e.g. from crawlers following
+broken links) are answered with ``404`` from memory until the entry expires.
+Entries are dropped when the persistent identifier is created in this
+process.
+"""
+
+RECORDS_UI_NEGATIVE_CACHE_SIZE = 10000
+"""Maximum number of unknown persistent identifiers kept in the cache."""
+
+RECORDS_UI_NEGATIVE_CACHE_TIMEOUT = 60
+"""Number of seconds after which an unknown persistent identifier expires."""
+
+RECORDS_UI_REDIRECT_CACHE = False
+"""Cache final destinations of redirected persistent identifiers.
+
+Cached redirects are answered without resolving the persistent identifier.
+Entries are dropped when any persistent identifier of the redirection chain
+is changed in this process.
+"""
+
+RECORDS_UI_REDIRECT_CACHE_SIZE = 10000
+"""Maximum number of redirected persistent identifiers kept in the cache."""
+
+RECORDS_UI_REDIRECT_CACHE_TIMEOUT = 3600
+"""Number of seconds after which a cached redirect expires."""
+
+RECORDS_UI_TOMBSTONE_CACHE = False
+"""Cache rendered tombstones of deleted persistent identifiers.
+
+Tombstones are cached per persistent identifier, template and locale, and are
+dropped when the persistent identifier or its record is changed in this
+process. Like pages (see ``RECORDS_UI_PAGE_CACHE_SIZE``), only tombstones
+rendered for anonymous users without pending flashed messages are cached.
+"""
+
+RECORDS_UI_TOMBSTONE_CACHE_SIZE = 10000
+"""Maximum number of tombstones kept in the cache."""
+
+RECORDS_UI_TOMBSTONE_CACHE_TIMEOUT = None
+"""Number of seconds after which a cached tombstone expires."""
+
+RECORDS_UI_RECORD_CONTENT_MAX_DEPTH = None
+"""Maximum nesting depth of metadata shown in the detail page.
+
+Deeper mappings and lists are shown as an ellipsis. (Default: unlimited)
+"""
+
+RECORDS_UI_RECORD_CONTENT_MAX_NODES = None
+"""Maximum number of metadata keys and list items shown in the detail page.
+
+Further content is left out and shown as an ellipsis. (Default: unlimited)
+"""
+
+RECORDS_UI_RECORD_CONTENT_COLLAPSE = None
+"""Number of items above which nested metadata is collapsed in the detail page.
+
+Collapsed mappings and lists are replaced by a link, loaded in place when
+clicked, to the fragment endpoint of the persistent identifier type (named
+``<pid_type>_fragment``, using :func:`invenio_records_ui.views.fragment`),
+so that the size of the page does not grow with the size of the record.
+(Default: never collapse)
+"""
+
+RECORDS_UI_RECORD_CONTENT_CACHE_SIZE = 128
+"""Number of record revisions whose rendered metadata is kept in memory.
+
+Set to ``0`` to render the metadata on every request.
+"""
+
+RECORDS_UI_TEMPLATE_WARMUP = False
+"""Compile the templates of the configured endpoints at application startup.
+
+Templates are compiled once all extensions and blueprints are loaded, so that
+the first requests of new workers do not pay for it. The templates can also
+be compiled with ``flask records-ui warmup``.
+"""
+
+RECORDS_UI_TEMPLATE_BYTECODE_CACHE = None
+"""Directory in which compiled templates are stored and shared by processes.
+
+Run ``flask records-ui warmup`` at deploy time to fill it. (Default: ``None``,
+compiled templates are only kept in memory)
+"""
+
+RECORDS_UI_PERMISSION_CACHE = False
+"""Cache permission decisions of the record views.
+
+Decisions are cached per identity (the needs it provides), persistent
+identifier, record revision and permission factory, so they are recomputed
+as soon as the record or the roles of the user change. Use a short timeout if
+permissions depend on anything else, e.g. the time of the request.
+"""
+
+RECORDS_UI_PERMISSION_CACHE_SIZE = 10000
+"""Maximum number of permission decisions kept in the cache."""
+
+RECORDS_UI_PERMISSION_CACHE_TIMEOUT = 60
+"""Number of seconds after which a cached permission decision expires."""
+
+RECORDS_UI_METRICS = False
+"""Measure the duration of the phases of the record views.
+
+The phases are ``resolve`` (resolving the persistent identifier, including
+``load`` of the record), ``permission``, ``signals``, ``serialize`` (export
+formats) and ``render``, labeled by endpoint and persistent identifier type.
+"""
+
+RECORDS_UI_METRICS_FACTORY = "invenio_records_ui.metrics:MetricsRegistry"
+"""Factory of the metrics hook.
+
+Import path or callable returning an object with an ``observe(phase, seconds,
+endpoint, pid_type)`` method, e.g. an adapter to a metrics client. See
+:class:`invenio_records_ui.metrics.MetricsRegistry`.
+"""
+
+RECORDS_UI_METRICS_ENDPOINT = None
+"""Route exposing the metrics in the Prometheus text format.
+
+E.g. ``"/records-ui/metrics"``. Only supported by metrics hooks providing a
+``render()`` method. Protect the route, e.g. in the web server, if the
+metrics must not be public. (Default: ``None``, not exposed)
+"""
+
+RECORDS_UI_SERVER_TIMING = False
+"""Add a ``Server-Timing`` header to the responses of the record views.
+
+The header contains the duration in milliseconds of the phases measured for
+``RECORDS_UI_METRICS`` and whether the page, export, persistent identifier,
+redirect and permission caches were hit, e.g.
+``resolve;dur=2.104, render;dur=8.310, cache-page;desc="miss"``. The header
+is visible to all clients, so consider enabling it only on internal
+deployments.
+"""
+
+RECORDS_UI_ASYNC_SIGNALS = False
+"""Deliver the ``record_viewed`` signal asynchronously.
+
+Views are handed to a pool of worker threads instead of calling the signal
+receivers while rendering the page. See
+:class:`invenio_records_ui.events.AsyncSignalDispatcher` for what receivers
+can access (notably, ``current_user`` is not available).
+"""
+
+RECORDS_UI_ASYNC_SIGNALS_WORKERS = 1
+"""Number of worker threads delivering record view signals."""
+
+RECORDS_UI_ASYNC_SIGNALS_QUEUE_SIZE = 10000
+"""Maximum number of record views waiting to be delivered."""
+
+RECORDS_UI_ASYNC_SIGNALS_TIMEOUT = 0
+"""Seconds a view waits for room in a full queue before being dropped."""
+
+RECORDS_UI_VIEW_EVENT_SINK = None
+"""Sink of buffered record view events (callable or import path).
+
+If set, record views are counted in memory per persistent identifier, time
+window and visitor session, and written to the sink in bulk, see
+:class:`invenio_records_ui.events.ViewEventBuffer`. E.g. to append the events
+to a file:
+
+.. code-block:: python
+
+    from invenio_records_ui.events import JSONLinesSink
+
+    RECORDS_UI_VIEW_EVENT_SINK = JSONLinesSink("/var/log/invenio/views.jsonl")
+"""
+
+RECORDS_UI_VIEW_EVENT_WINDOW = 3600
+"""Length in seconds of the time windows record views are counted in."""
+
+RECORDS_UI_VIEW_EVENT_FLUSH_INTERVAL = 60
+"""Seconds between two writes of the buffered record view events."""
+
+RECORDS_UI_VIEW_EVENT_FLUSH_SIZE = 1000
+"""Number of buffered record view events triggering a write."""
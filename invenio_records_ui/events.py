@@ -0,0 +1,409 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Delivery of record view events."""
+
+from __future__ import absolute_import, print_function
+
+import atexit
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import namedtuple
+
+from flask import current_app, g, request
+from invenio_pidstore.models import PersistentIdentifier
+from six.moves import queue
+
+from .signals import record_viewed
+
+RecordView = namedtuple(
+    "RecordView",
+    [
+        "pid_type",
+        "pid_value",
+        "record_id",
+        "revision_id",
+        "user_id",
+        "remote_addr",
+        "user_agent",
+        "url",
+        "timestamp",
+    ],
+)
+"""Snapshot of the request data of a record view."""
+
+
+def snapshot_view(pid, record):
+    """Take a snapshot of the current request for a record view.
+
+    :param pid: PID object.
+    :param record: Record object.
+    :returns: A :class:`RecordView` instance.
+    """
+    user_id = None
+    if hasattr(current_app, "login_manager"):
+        from flask_login import current_user
+
+        if current_user.is_authenticated:
+            user_id = current_user.get_id()
+    return RecordView(
+        pid_type=pid.pid_type,
+        pid_value=pid.pid_value,
+        record_id=str(record.id) if record.id else None,
+        revision_id=record.revision_id,
+        user_id=user_id,
+        remote_addr=request.remote_addr,
+        user_agent=request.user_agent.string,
+        url=request.url,
+        timestamp=time.time(),
+    )
+
+
+def send_record_viewed(pid, record):
+    """Send the :data:`invenio_records_ui.signals.record_viewed` signal.
+
+    The signal is delivered asynchronously if ``RECORDS_UI_ASYNC_SIGNALS`` is
+    enabled.
+
+    :param pid: PID object.
+    :param record: Record object.
+    """
+    dispatcher = current_app.extensions["invenio-records-ui"].signal_dispatcher
+    if dispatcher is None:
+        record_viewed.send(
+            current_app._get_current_object(),
+            pid=pid,
+            record=record,
+        )
+    else:
+        dispatcher.dispatch(pid, record)
+
+
+def detach_view(pid, record):
+    """Make copies of a viewed PID and record not bound to a session.
+
+    :param pid: PID object.
+    :param record: Record object.
+    :returns: A tuple containing (pid, record) copies.
+    """
+    pid_copy = PersistentIdentifier(
+        id=pid.id,
+        pid_type=pid.pid_type,
+        pid_value=pid.pid_value,
+        pid_provider=pid.pid_provider,
+        status=pid.status,
+        object_type=pid.object_type,
+        object_uuid=pid.object_uuid,
+    )
+    record_copy = record.__class__(copy.deepcopy(dict(record)))
+    return pid_copy, record_copy
+
+
+class AsyncSignalDispatcher(object):
+    """Deliver record view signals from a pool of worker threads.
+
+    Views are queued in a bounded queue as detached copies of the PID and
+    record (see :func:`detach_view`) together with a :class:`RecordView`
+    snapshot of the request. Worker threads send the signal inside an
+    application context only, with the snapshot available as
+    ``flask.g.record_view``.
+
+    Receivers must therefore not use the current request, ``current_user`` or
+    the database session objects of the original request: the record copy has
+    no model (use ``g.record_view.record_id`` and ``g.record_view.revision_id``
+    instead) and the user is given by ``g.record_view.user_id``.
+
+    If the queue is full, the view is dropped after waiting at most
+    ``timeout`` seconds, and counted in ``dropped``.
+    """
+
+    def __init__(self, app, workers=1, queue_size=10000, timeout=0):
+        """Initialize dispatcher.
+
+        :param app: The Flask application.
+        :param workers: Number of worker threads.
+        :param queue_size: Maximum number of pending views.
+        :param timeout: Seconds to wait for a free slot in a full queue.
+        """
+        self.app = app
+        self.workers = workers
+        self.timeout = timeout
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._started = False
+        self._atexit = False
+
+    def dispatch(self, pid, record):
+        """Queue a record view.
+
+        :param pid: PID object.
+        :param record: Record object.
+        """
+        self._start()
+        item = detach_view(pid, record) + (snapshot_view(pid, record),)
+        try:
+            if self.timeout:
+                self._queue.put(item, timeout=self.timeout)
+            else:
+                self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def flush(self):
+        """Wait until all queued views have been delivered."""
+        self._queue.join()
+
+    def shutdown(self, timeout=5):
+        """Deliver queued views and stop the worker threads.
+
+        :param timeout: Maximum number of seconds to wait for each worker
+            thread. Views still queued afterwards are lost.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+            self._started = False
+        for dummy in threads:
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                break
+        for thread in threads:
+            thread.join(timeout)
+
+    def _start(self):
+        """Start the worker threads if needed."""
+        if self._started:
+            return
+        with self._lock:
+            if self._started:
+                return
+            for dummy in range(self.workers):
+                thread = threading.Thread(
+                    target=self._work, name="records-ui-signals", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+            if not self._atexit:
+                atexit.register(self.shutdown)
+                self._atexit = True
+            self._started = True
+
+    def _work(self):
+        """Deliver queued views until stopped."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._send(*item)
+            except Exception:
+                with self._lock:
+                    self.failed += 1
+                self.app.logger.exception("Failed to deliver record view.")
+            finally:
+                self._queue.task_done()
+
+    def _send(self, pid, record, view):
+        """Send the signal for a queued view."""
+        with self.app.app_context():
+            g.record_view = view
+            record_viewed.send(self.app, pid=pid, record=record)
+        with self._lock:
+            self.sent += 1
+
+
+ViewEvent = namedtuple(
+    "ViewEvent",
+    [
+        "pid_type",
+        "pid_value",
+        "record_id",
+        "window",
+        "session_hash",
+        "count",
+    ],
+)
+"""Number of views of a record in a time window by one visitor session."""
+
+
+def session_hash(view):
+    """Compute an anonymous visitor session identifier of a record view.
+
+    Views of logged in users are attributed to the user, other views to the
+    remote address and user agent.
+
+    :param view: A :class:`RecordView` instance.
+    :returns: A hexadecimal digest.
+    """
+    if view.user_id is not None:
+        value = "user:{0}".format(view.user_id)
+    else:
+        value = "addr:{0}:{1}".format(view.remote_addr, view.user_agent)
+    return hashlib.sha1(value.encode("utf8")).hexdigest()
+
+
+class JSONLinesSink(object):
+    """View event sink appending events to a file as JSON lines."""
+
+    def __init__(self, path):
+        """Initialize sink.
+
+        :param path: Path of the file to append events to.
+        """
+        self.path = path
+
+    def __call__(self, events):
+        """Write view events.
+
+        :param events: List of :class:`ViewEvent` instances.
+        """
+        with open(self.path, "a") as fp:
+            for event in events:
+                fp.write(json.dumps(event._asdict(), sort_keys=True))
+                fp.write("\n")
+
+
+class ViewEventBuffer(object):
+    """Coalesce record views in memory and write them to a sink in bulk.
+
+    Views are counted per persistent identifier, time window and visitor
+    session (see :func:`session_hash`), and handed to the sink as a list of
+    :class:`ViewEvent` every ``interval`` seconds, or as soon as
+    ``size`` distinct events are buffered. The sink is any callable taking
+    the list of events, e.g. a :class:`JSONLinesSink` or a function inserting
+    the events in a database table. If the sink fails, the events are kept
+    and written with the next flush.
+    """
+
+    def __init__(self, app, sink, window=3600, interval=60, size=1000):
+        """Initialize buffer.
+
+        :param app: The Flask application.
+        :param sink: Callable taking a list of :class:`ViewEvent`.
+        :param window: Length in seconds of the time windows views are
+            counted in.
+        :param interval: Seconds between two flushes.
+        :param size: Number of buffered events triggering a flush.
+        """
+        self.app = app
+        self.sink = sink
+        self.window = window
+        self.interval = interval
+        self.size = size
+        self._events = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._atexit = False
+
+    def add(self, view):
+        """Count a record view.
+
+        :param view: A :class:`RecordView` instance.
+        """
+        window = int(view.timestamp // self.window * self.window)
+        key = (view.pid_type, view.pid_value, window, session_hash(view))
+        with self._lock:
+            record_id, count = self._events.get(key, (None, 0))
+            self._events[key] = (view.record_id or record_id, count + 1)
+            full = len(self._events) >= self.size
+        self._start()
+        if full:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write all buffered events to the sink."""
+        with self._flush_lock:
+            with self._lock:
+                events, self._events = self._events, {}
+            if not events:
+                return
+            try:
+                self.sink(
+                    [
+                        ViewEvent(
+                            pid_type=pid_type,
+                            pid_value=pid_value,
+                            record_id=record_id,
+                            window=window,
+                            session_hash=session,
+                            count=count,
+                        )
+                        for (pid_type, pid_value, window, session), (
+                            record_id,
+                            count,
+                        ) in events.items()
+                    ]
+                )
+            except Exception:
+                self.app.logger.exception("Failed to write record view events.")
+                with self._lock:
+                    for key, (record_id, count) in events.items():
+                        dummy_id, new_count = self._events.get(key, (None, 0))
+                        self._events[key] = (record_id, count + new_count)
+
+    def shutdown(self, timeout=5):
+        """Stop the flush thread and write the buffered events.
+
+        :param timeout: Maximum number of seconds to wait for the thread.
+        """
+        self._stopped.set()
+        self._wakeup.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+        self.flush()
+
+    def __len__(self):
+        """Get number of buffered events."""
+        return len(self._events)
+
+    def _start(self):
+        """Start the flush thread if needed."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._work, name="records-ui-view-events", daemon=True
+            )
+            self._thread.start()
+            if not self._atexit:
+                atexit.register(self.shutdown)
+                self._atexit = True
+
+    def _work(self):
+        """Flush the buffer periodically until stopped."""
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            if not self._stopped.is_set():
+                self.flush()
+
+
+def buffer_record_view(sender, pid=None, record=None, **kwargs):
+    """Count a record view in the view event buffer, if enabled.
+
+    Connected to :data:`invenio_records_ui.signals.record_viewed`.
+
+    :param sender: The Flask application which sent the signal.
+    :param pid: PID object.
+    :param record: Record object.
+    """
+    state = getattr(sender, "extensions", {}).get("invenio-records-ui")
+    buffer = state.view_event_buffer if state is not None else None
+    if buffer is not None:
+        view = g.get("record_view") or snapshot_view(pid, record)
+        buffer.add(view)
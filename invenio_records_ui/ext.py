@@ -5,7 +5,28 @@
 
 from __future__ import absolute_import, print_function
 
+from invenio_db import db
+from invenio_records.signals import (
+    after_record_delete,
+    after_record_insert,
+    after_record_revert,
+    after_record_update,
+)
+from jinja2 import FileSystemBytecodeCache, TemplateNotFound, meta
+from sqlalchemy import event
+
 from . import config
+from .artifacts import ArtifactGenerator
+from .events import AsyncSignalDispatcher, ViewEventBuffer, buffer_record_view
+from .receivers import (
+    discard_invalidations,
+    generate_artifacts,
+    invalidate_committed,
+    invalidate_pids,
+    invalidate_record,
+    track_artifacts,
+)
+from .signals import record_viewed
 from .utils import obj_or_import_string
 
 
@@ -20,6 +41,19 @@ class _RecordUIState(object):
         self.app = app
         self._permission_factory = None
         self._export_formats = {}
+        self._export_mimetypes = {}
+        self._page_cache = None
+        self._export_caches = {}
+        self._pid_cache = None
+        self._negative_cache = None
+        self._redirect_cache = None
+        self._tombstone_cache = None
+        self._permission_cache = None
+        self._record_content_cache = None
+        self._signal_dispatcher = None
+        self._view_event_buffer = None
+        self._metrics = None
+        self._export_artifacts = None
 
     def export_formats(self, pid_type):
         """List of export formats."""
@@ -33,6 +67,49 @@ class _RecordUIState(object):
             )
         return self._export_formats[pid_type]
 
+    def export_mimetypes(self, pid_type):
+        """Export formats by mimetype, for content negotiation.
+
+        Formats without a ``mimetype``, or with ``text/html``, are left out.
+        If several formats share a mimetype, the first in order is used.
+
+        :param pid_type: Persistent identifier type.
+        :returns: Dictionary of mimetypes to tuples (format slug, format
+            options).
+        """
+        if pid_type not in self._export_mimetypes:
+            mimetypes = {}
+            for slug, fmt in self.export_formats(pid_type):
+                mimetype = fmt.get("mimetype")
+                if mimetype and mimetype != "text/html":
+                    mimetypes.setdefault(mimetype, (slug, fmt))
+            self._export_mimetypes[pid_type] = mimetypes
+        return self._export_mimetypes[pid_type]
+
+    def export_cache(self, pid_type, slug):
+        """Cache of serialized records for an export format.
+
+        :param pid_type: Persistent identifier type.
+        :param slug: Export format slug.
+        :returns: The cache, or ``None`` if the format is not cached.
+        """
+        key = (pid_type, slug)
+        if key not in self._export_caches:
+            fmt = (
+                self.app.config.get("RECORDS_UI_EXPORT_FORMATS", {})
+                .get(pid_type, {})
+                .get(slug)
+            )
+            options = fmt.get("cache") if fmt else None
+            if options:
+                options = options if isinstance(options, dict) else {}
+                self._export_caches[key] = self.create_cache(
+                    options.get("maxsize", 256), options.get("timeout")
+                )
+            else:
+                self._export_caches[key] = None
+        return self._export_caches[key]
+
     @property
     def permission_factory(self):
         """Load default permission factory."""
@@ -41,6 +118,326 @@ class _RecordUIState(object):
             self._permission_factory = obj_or_import_string(imp)
         return self._permission_factory
 
+    @property
+    def page_cache(self):
+        """Cache of pages rendered by the default view method."""
+        if self._page_cache is None:
+            self._page_cache = self.create_cache(
+                self.app.config["RECORDS_UI_PAGE_CACHE_SIZE"],
+                self.app.config["RECORDS_UI_PAGE_CACHE_TIMEOUT"],
+            )
+        return self._page_cache
+
+    @property
+    def pid_cache(self):
+        """Cache of resolved persistent identifiers.
+
+        The ``hits``, ``misses`` and ``evictions`` counters of the cache can
+        be used to monitor its efficiency.
+
+        :returns: The cache, or ``None`` if ``RECORDS_UI_PID_CACHE`` is off.
+        """
+        if self._pid_cache is None and self.app.config["RECORDS_UI_PID_CACHE"]:
+            self._pid_cache = self.create_cache(
+                self.app.config["RECORDS_UI_PID_CACHE_SIZE"],
+                self.app.config["RECORDS_UI_PID_CACHE_TIMEOUT"],
+            )
+        return self._pid_cache
+
+    @property
+    def negative_cache(self):
+        """Cache of persistent identifiers which do not exist.
+
+        :returns: The cache, or ``None`` if ``RECORDS_UI_NEGATIVE_CACHE`` is
+            off.
+        """
+        if (
+            self._negative_cache is None
+            and self.app.config["RECORDS_UI_NEGATIVE_CACHE"]
+        ):
+            self._negative_cache = self.create_cache(
+                self.app.config["RECORDS_UI_NEGATIVE_CACHE_SIZE"],
+                self.app.config["RECORDS_UI_NEGATIVE_CACHE_TIMEOUT"],
+            )
+        return self._negative_cache
+
+    @property
+    def redirect_cache(self):
+        """Cache of final destinations of redirected persistent identifiers.
+
+        :returns: The cache, or ``None`` if ``RECORDS_UI_REDIRECT_CACHE`` is
+            off.
+        """
+        if (
+            self._redirect_cache is None
+            and self.app.config["RECORDS_UI_REDIRECT_CACHE"]
+        ):
+            self._redirect_cache = self.create_cache(
+                self.app.config["RECORDS_UI_REDIRECT_CACHE_SIZE"],
+                self.app.config["RECORDS_UI_REDIRECT_CACHE_TIMEOUT"],
+            )
+        return self._redirect_cache
+
+    @property
+    def tombstone_cache(self):
+        """Cache of rendered tombstones.
+
+        :returns: The cache, or ``None`` if ``RECORDS_UI_TOMBSTONE_CACHE`` is
+            off.
+        """
+        if (
+            self._tombstone_cache is None
+            and self.app.config["RECORDS_UI_TOMBSTONE_CACHE"]
+        ):
+            self._tombstone_cache = self.create_cache(
+                self.app.config["RECORDS_UI_TOMBSTONE_CACHE_SIZE"],
+                self.app.config["RECORDS_UI_TOMBSTONE_CACHE_TIMEOUT"],
+            )
+        return self._tombstone_cache
+
+    @property
+    def permission_cache(self):
+        """Cache of permission decisions.
+
+        :returns: The cache, or ``None`` if ``RECORDS_UI_PERMISSION_CACHE`` is
+            off.
+        """
+        if (
+            self._permission_cache is None
+            and self.app.config["RECORDS_UI_PERMISSION_CACHE"]
+        ):
+            self._permission_cache = self.create_cache(
+                self.app.config["RECORDS_UI_PERMISSION_CACHE_SIZE"],
+                self.app.config["RECORDS_UI_PERMISSION_CACHE_TIMEOUT"],
+            )
+        return self._permission_cache
+
+    @property
+    def record_content_cache(self):
+        """Cache of record metadata rendered for the detail page.
+
+        Entries are keyed by record revision, and thus never invalidated.
+
+        :returns: The cache, or ``None`` if
+            ``RECORDS_UI_RECORD_CONTENT_CACHE_SIZE`` is ``0``.
+        """
+        if (
+            self._record_content_cache is None
+            and self.app.config["RECORDS_UI_RECORD_CONTENT_CACHE_SIZE"]
+        ):
+            self._record_content_cache = self.create_cache(
+                self.app.config["RECORDS_UI_RECORD_CONTENT_CACHE_SIZE"]
+            )
+        return self._record_content_cache
+
+    @property
+    def signal_dispatcher(self):
+        """Asynchronous dispatcher of record view signals.
+
+        :returns: The dispatcher, or ``None`` if ``RECORDS_UI_ASYNC_SIGNALS``
+            is off.
+        """
+        if (
+            self._signal_dispatcher is None
+            and self.app.config["RECORDS_UI_ASYNC_SIGNALS"]
+        ):
+            self._signal_dispatcher = AsyncSignalDispatcher(
+                self.app,
+                workers=self.app.config["RECORDS_UI_ASYNC_SIGNALS_WORKERS"],
+                queue_size=self.app.config["RECORDS_UI_ASYNC_SIGNALS_QUEUE_SIZE"],
+                timeout=self.app.config["RECORDS_UI_ASYNC_SIGNALS_TIMEOUT"],
+            )
+        return self._signal_dispatcher
+
+    @property
+    def view_event_buffer(self):
+        """Buffer of record view events.
+
+        :returns: The buffer, or ``None`` if ``RECORDS_UI_VIEW_EVENT_SINK`` is
+            not set.
+        """
+        if (
+            self._view_event_buffer is None
+            and self.app.config["RECORDS_UI_VIEW_EVENT_SINK"]
+        ):
+            self._view_event_buffer = ViewEventBuffer(
+                self.app,
+                obj_or_import_string(self.app.config["RECORDS_UI_VIEW_EVENT_SINK"]),
+                window=self.app.config["RECORDS_UI_VIEW_EVENT_WINDOW"],
+                interval=self.app.config["RECORDS_UI_VIEW_EVENT_FLUSH_INTERVAL"],
+                size=self.app.config["RECORDS_UI_VIEW_EVENT_FLUSH_SIZE"],
+            )
+        return self._view_event_buffer
+
+    @property
+    def metrics(self):
+        """Hook receiving the timings of the phases of record views.
+
+        :returns: The hook, or ``None`` if ``RECORDS_UI_METRICS`` is off.
+        """
+        if self._metrics is None and self.app.config["RECORDS_UI_METRICS"]:
+            factory = obj_or_import_string(
+                self.app.config["RECORDS_UI_METRICS_FACTORY"]
+            )
+            self._metrics = factory()
+        return self._metrics
+
+    @property
+    def export_artifacts(self):
+        """Generator of precomputed export artifacts.
+
+        :returns: The :class:`invenio_records_ui.artifacts.ArtifactGenerator`,
+            or ``None`` if ``RECORDS_UI_EXPORT_ARTIFACTS`` is off.
+        """
+        if (
+            self._export_artifacts is None
+            and self.app.config["RECORDS_UI_EXPORT_ARTIFACTS"]
+        ):
+            factory = obj_or_import_string(
+                self.app.config["RECORDS_UI_EXPORT_ARTIFACTS_STORE"]
+            )
+            self._export_artifacts = ArtifactGenerator(
+                self.app,
+                factory(self.app),
+                workers=self.app.config["RECORDS_UI_EXPORT_ARTIFACTS_WORKERS"],
+            )
+        return self._export_artifacts
+
+    def create_cache(self, maxsize, timeout=None):
+        """Create a cache using the configured cache backend.
+
+        :param maxsize: Maximum number of entries.
+        :param timeout: Default expiry of entries in seconds.
+        :returns: A cache instance.
+        """
+        backend = obj_or_import_string(self.app.config["RECORDS_UI_CACHE_BACKEND"])
+        return backend(maxsize=maxsize, timeout=timeout)
+
+    @property
+    def has_caches(self):
+        """Check if any cache has been created yet."""
+        return any(
+            cache is not None
+            for cache in (
+                self._page_cache,
+                self._pid_cache,
+                self._negative_cache,
+                self._redirect_cache,
+                self._tombstone_cache,
+                self._permission_cache,
+            )
+        ) or any(cache is not None for cache in self._export_caches.values())
+
+    def invalidate(self, record):
+        """Drop all cached data for a record.
+
+        :param record: The record which changed.
+        """
+        self.invalidate_record_id(record.id)
+
+    def invalidate_record_id(self, record_id):
+        """Drop all cached data for a record.
+
+        :param record_id: The identifier of the record which changed.
+        """
+        tag = str(record_id)
+        if self._page_cache is not None:
+            self._page_cache.invalidate(tag)
+        for cache in list(self._export_caches.values()):
+            if cache is not None:
+                cache.invalidate(tag)
+        if self._pid_cache is not None:
+            self._pid_cache.invalidate(tag)
+        if self._tombstone_cache is not None:
+            self._tombstone_cache.invalidate(tag)
+        if self._permission_cache is not None:
+            self._permission_cache.invalidate(tag)
+
+    def templates(self):
+        """List the templates used by the configured endpoints.
+
+        :returns: List of template names, without the templates they extend
+            or include.
+        """
+        config = self.app.config
+        names = [
+            config["RECORDS_UI_BASE_TEMPLATE"],
+            config["RECORDS_UI_TOMBSTONE_TEMPLATE"],
+            "invenio_records_ui/export_well.html",
+        ]
+        for options in (config.get("RECORDS_UI_ENDPOINTS") or {}).values():
+            names.append(options.get("template") or "invenio_records_ui/detail.html")
+        return list(dict.fromkeys(names))
+
+    def warmup_templates(self):
+        """Compile the templates used by the configured endpoints.
+
+        Templates extended, included or imported by them with a constant name
+        are compiled as well. Compiled templates are kept by the Jinja
+        environment (and its bytecode cache, if any), so that the first
+        request to an endpoint does not pay for compiling them.
+
+        :returns: List of compiled template names.
+        """
+        env = self.app.jinja_env
+        pending = self.templates()
+        compiled = []
+        while pending:
+            name = pending.pop(0)
+            if name in compiled:
+                continue
+            try:
+                env.get_template(name)
+                source = env.loader.get_source(env, name)[0]
+            except TemplateNotFound:
+                self.app.logger.warning("Template {0} not found.".format(name))
+                continue
+            compiled.append(name)
+            pending.extend(
+                ref
+                for ref in meta.find_referenced_templates(env.parse(source))
+                if ref is not None
+            )
+        return compiled
+
+    def invalidate_pid(self, pid_type, pid_value):
+        """Drop cached data for a persistent identifier.
+
+        :param pid_type: Persistent identifier type.
+        :param pid_value: Persistent identifier value.
+        """
+        key = (pid_type, pid_value)
+        if self._pid_cache is not None:
+            self._pid_cache.delete(key)
+        if self._negative_cache is not None:
+            self._negative_cache.delete(key)
+        if self._redirect_cache is not None:
+            self._redirect_cache.invalidate(key)
+        if self._tombstone_cache is not None:
+            self._tombstone_cache.invalidate(key)
+
+
+def init_bytecode_cache(app):
+    """Store compiled templates in ``RECORDS_UI_TEMPLATE_BYTECODE_CACHE``.
+
+    :param app: The Flask application.
+    """
+    directory = app.config.get("RECORDS_UI_TEMPLATE_BYTECODE_CACHE")
+    if directory and app.jinja_env.bytecode_cache is None:
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+
+def finalize_app(app):
+    """Warm up the templates once the application is loaded.
+
+    Registered as ``invenio_base.finalize_app`` entry point.
+
+    :param app: The Flask application.
+    """
+    init_bytecode_cache(app)
+    if app.config["RECORDS_UI_TEMPLATE_WARMUP"]:
+        app.extensions["invenio-records-ui"].warmup_templates()
+
 
 class InvenioRecordsUI(object):
     """Invenio-Records-UI extension.
@@ -64,6 +461,26 @@ class InvenioRecordsUI(object):
         """
         self.init_config(app)
         app.extensions["invenio-records-ui"] = _RecordUIState(app)
+        for signal in (after_record_update, after_record_delete, after_record_revert):
+            signal.connect(invalidate_record)
+        if app.config["RECORDS_UI_VIEW_EVENT_SINK"]:
+            record_viewed.connect(buffer_record_view)
+        if app.config["RECORDS_UI_EXPORT_ARTIFACTS"]:
+            for signal in (
+                after_record_insert,
+                after_record_update,
+                after_record_delete,
+                after_record_revert,
+            ):
+                signal.connect(track_artifacts)
+        for name, listener in (
+            ("after_flush", invalidate_pids),
+            ("after_commit", invalidate_committed),
+            ("after_commit", generate_artifacts),
+            ("after_soft_rollback", discard_invalidations),
+        ):
+            if not event.contains(db.session, name, listener):
+                event.listen(db.session, name, listener)
 
     def init_config(self, app):
         """Initialize configuration on application.
@@ -0,0 +1,193 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Timing of the phases of the record views."""
+
+from __future__ import absolute_import, print_function
+
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import current_app, has_request_context, request
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+"""Upper bounds in seconds of the histogram buckets of :class:`MetricsRegistry`."""
+
+SERVER_TIMING_KEY = "invenio_records_ui.server_timing"
+"""WSGI environment key of the ``Server-Timing`` entries of a request."""
+
+
+class MetricsRegistry(object):
+    """In-process registry of phase timings.
+
+    Timings are kept as histograms per phase, endpoint and persistent
+    identifier type, and can be exposed in the Prometheus text format with
+    :meth:`render`. Any object providing ``observe(phase, seconds, endpoint,
+    pid_type)`` can be used instead via ``RECORDS_UI_METRICS_FACTORY``.
+    """
+
+    name = "invenio_records_ui_phase_seconds"
+    """Name of the exposed metric."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Initialize registry.
+
+        :param buckets: Sorted upper bounds of the histogram buckets.
+        """
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, phase, seconds, endpoint, pid_type):
+        """Record the duration of a phase.
+
+        :param phase: Name of the phase, e.g. ``resolve``.
+        :param seconds: Duration in seconds.
+        :param endpoint: Name of the endpoint of the request.
+        :param pid_type: Persistent identifier type of the endpoint.
+        """
+        key = (phase, endpoint, pid_type)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0, 0.0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[i] += 1
+            series[1] += 1
+            series[2] += seconds
+
+    def get(self, phase, endpoint, pid_type):
+        """Get the number of observations and their total duration.
+
+        :param phase: Name of the phase.
+        :param endpoint: Name of the endpoint.
+        :param pid_type: Persistent identifier type.
+        :returns: Tuple (count, sum).
+        """
+        with self._lock:
+            dummy_counts, count, total = self._series.get(
+                (phase, endpoint, pid_type), (None, 0, 0.0)
+            )
+            return count, total
+
+    def render(self):
+        """Render the timings in the Prometheus text exposition format.
+
+        :returns: The metrics as text.
+        """
+        lines = [
+            "# HELP {0} Time spent in the phases of record views.".format(self.name),
+            "# TYPE {0} histogram".format(self.name),
+        ]
+        with self._lock:
+            series = sorted(
+                (key, (list(value[0]), value[1], value[2]))
+                for key, value in self._series.items()
+            )
+        for (phase, endpoint, pid_type), (counts, count, total) in series:
+            labels = 'endpoint="{0}",phase="{1}",pid_type="{2}"'.format(
+                _escape_label(endpoint), _escape_label(phase), _escape_label(pid_type)
+            )
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(
+                    '{0}_bucket{{{1},le="{2}"}} {3}'.format(
+                        self.name, labels, bound, bucket_count
+                    )
+                )
+            lines.append(
+                '{0}_bucket{{{1},le="+Inf"}} {2}'.format(self.name, labels, count)
+            )
+            lines.append("{0}_sum{{{1}}} {2}".format(self.name, labels, total))
+            lines.append("{0}_count{{{1}}} {2}".format(self.name, labels, count))
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value):
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+@contextmanager
+def timed(phase, pid_type=None):
+    """Measure the duration of a phase of the current request.
+
+    The duration is passed to the metrics hook of the application, if
+    ``RECORDS_UI_METRICS`` is enabled, labeled by the endpoint of the request
+    and the persistent identifier type.
+
+    :param phase: Name of the phase, e.g. ``resolve``.
+    :param pid_type: Persistent identifier type of the endpoint.
+    """
+    metrics = current_app.extensions["invenio-records-ui"].metrics
+    timing = _server_timing()
+    if metrics is None and timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        if metrics is not None:
+            endpoint = request.endpoint if has_request_context() else None
+            metrics.observe(phase, seconds, endpoint, pid_type)
+        if timing is not None:
+            phases = timing["phases"]
+            phases[phase] = phases.get(phase, 0.0) + seconds
+
+
+def _server_timing():
+    """Get the ``Server-Timing`` entries of the current request.
+
+    :returns: Dictionary with the ``phases`` and ``caches`` entries, or
+        ``None`` if ``RECORDS_UI_SERVER_TIMING`` is off.
+    """
+    if not has_request_context() or not current_app.config["RECORDS_UI_SERVER_TIMING"]:
+        return None
+    return request.environ.setdefault(SERVER_TIMING_KEY, dict(phases={}, caches={}))
+
+
+def cache_lookup(name, hit):
+    """Report the outcome of a cache lookup in the ``Server-Timing`` header.
+
+    :param name: Name of the cache, e.g. ``page``.
+    :param hit: Whether the lookup was a hit.
+    """
+    timing = _server_timing()
+    if timing is not None:
+        timing["caches"][name] = "hit" if hit else "miss"
+
+
+def server_timing_header():
+    """Build the ``Server-Timing`` header of the current request.
+
+    Phases are reported in milliseconds (e.g. ``render;dur=1.234``) and cache
+    lookups with their outcome (e.g. ``cache-page;desc="hit"``).
+
+    :returns: The header value, or ``None`` if there is nothing to report.
+    """
+    timing = _server_timing()
+    if not timing:
+        return None
+    entries = [
+        "{0};dur={1:.3f}".format(phase, seconds * 1000)
+        for phase, seconds in timing["phases"].items()
+    ]
+    entries.extend(
+        'cache-{0};desc="{1}"'.format(name, outcome)
+        for name, outcome in timing["caches"].items()
+    )
+    return ", ".join(entries) or None
+
+
+def metrics_view():
+    """Expose the metrics in the Prometheus text format."""
+    metrics = current_app.extensions["invenio-records-ui"].metrics
+    if metrics is None or not hasattr(metrics, "render"):
+        return current_app.response_class(status=404)
+    return current_app.response_class(
+        metrics.render(), mimetype="text/plain; version=0.0.4"
+    )
@@ -0,0 +1,130 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Signal receivers for Invenio-Records-UI.
+
+Cached data is dropped as soon as a record or persistent identifier is
+changed, and once more after the transaction is committed, so that pages
+rendered by concurrent requests from the not yet committed data are not kept.
+Export artifacts of changed records are generated after the commit.
+"""
+
+from __future__ import absolute_import, print_function
+
+from itertools import chain
+
+from flask import current_app
+from invenio_db import db
+from invenio_pidstore.models import PersistentIdentifier
+
+PENDING_RECORDS = "invenio_records_ui.pending_records"
+"""Key of the changed record ids in the session info."""
+
+PENDING_PIDS = "invenio_records_ui.pending_pids"
+"""Key of the changed persistent identifiers in the session info."""
+
+PENDING_ARTIFACTS = "invenio_records_ui.pending_artifacts"
+"""Key of the records needing new export artifacts in the session info."""
+
+
+def _get_state(app):
+    """Get the extension state if any cache is in use."""
+    state = getattr(app, "extensions", {}).get("invenio-records-ui")
+    if state is not None and state.has_caches:
+        return state
+
+
+def invalidate_record(sender, record=None, **kwargs):
+    """Drop cached data of a record once it has been changed.
+
+    :param sender: The Flask application which sent the signal.
+    :param record: The changed record.
+    """
+    state = _get_state(sender)
+    if state is not None and record is not None and record.id is not None:
+        state.invalidate_record_id(record.id)
+        db.session.info.setdefault(PENDING_RECORDS, set()).add(record.id)
+
+
+def invalidate_pids(session, flush_context):
+    """Drop cached data of persistent identifiers changed in a flush.
+
+    :param session: The SQLAlchemy session which was flushed.
+    :param flush_context: The flush context.
+    """
+    state = _get_state(current_app) if current_app else None
+    if state is None:
+        return
+    pids = set(
+        (obj.pid_type, obj.pid_value)
+        for obj in chain(session.new, session.dirty, session.deleted)
+        if isinstance(obj, PersistentIdentifier)
+    )
+    for pid_type, pid_value in pids:
+        state.invalidate_pid(pid_type, pid_value)
+    if pids:
+        session.info.setdefault(PENDING_PIDS, set()).update(pids)
+
+
+def invalidate_committed(session):
+    """Drop cached data of records and PIDs changed in a committed transaction.
+
+    :param session: The SQLAlchemy session which was committed.
+    """
+    if session.in_nested_transaction():
+        # Only a savepoint was released.
+        return
+    record_ids = session.info.pop(PENDING_RECORDS, ())
+    pids = session.info.pop(PENDING_PIDS, ())
+    state = _get_state(current_app) if current_app else None
+    if state is None:
+        return
+    for record_id in record_ids:
+        state.invalidate_record_id(record_id)
+    for pid_type, pid_value in pids:
+        state.invalidate_pid(pid_type, pid_value)
+
+
+def track_artifacts(sender, record=None, **kwargs):
+    """Remember a changed record to generate its export artifacts.
+
+    :param sender: The Flask application which sent the signal.
+    :param record: The changed record.
+    """
+    state = getattr(sender, "extensions", {}).get("invenio-records-ui")
+    if (
+        state is not None
+        and state.export_artifacts is not None
+        and record is not None
+        and record.id is not None
+    ):
+        db.session.info.setdefault(PENDING_ARTIFACTS, {})[record.id] = record.__class__
+
+
+def generate_artifacts(session):
+    """Generate the export artifacts of records changed in a transaction.
+
+    :param session: The SQLAlchemy session which was committed.
+    """
+    if session.in_nested_transaction():
+        # Only a savepoint was released.
+        return
+    records = session.info.pop(PENDING_ARTIFACTS, None)
+    if not records:
+        return
+    generator = current_app.extensions["invenio-records-ui"].export_artifacts
+    if generator is not None:
+        for record_id, record_class in records.items():
+            generator.schedule(record_class, record_id)
+
+
+def discard_invalidations(session, previous_transaction):
+    """Forget changed records and PIDs of a rolled back transaction.
+
+    :param session: The SQLAlchemy session which was rolled back.
+    :param previous_transaction: The transaction which was rolled back.
+    """
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_RECORDS, None)
+        session.info.pop(PENDING_PIDS, None)
+        session.info.pop(PENDING_ARTIFACTS, None)
@@ -0,0 +1,240 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Rendering of the generic record detail page."""
+
+from __future__ import absolute_import, print_function
+
+from collections.abc import Iterable, Mapping
+
+import six
+from markupsafe import Markup, escape
+
+THEMES = {
+    "bootstrap3": dict(
+        item=('<li class="list-group-item">', "</li>"),
+        mapping_key="<strong>{0}:</strong>",
+        mapping=('<ul class="list-group">', "</ul>"),
+        list_mapping=('<ul class="list-group">', "</ul>"),
+    ),
+    "semantic-ui": dict(
+        item=('<div class="content">', "</div>"),
+        mapping_key="<strong>{0}</strong>",
+        mapping=("<ul>", "</ul>"),
+        list_mapping=("<ul>", "</ul>"),
+    ),
+}
+"""Markup of the ``record_content`` macro of the detail templates per theme."""
+
+ELLIPSIS = "…"
+"""Text shown in place of content left out due to the depth or node limits."""
+
+PLACEHOLDER = '<a class="record-fragment" href="{0}">{1} ({2})</a>'
+"""Markup of collapsed content, linking to the fragment with the content."""
+
+
+def _is_list(value):
+    """Check if a value is rendered as a list (like Jinja's tests)."""
+    return isinstance(value, Iterable) and not isinstance(value, six.string_types)
+
+
+def _escape_pointer(token):
+    """Escape a JSON pointer reference token."""
+    return six.text_type(token).replace("~", "~0").replace("/", "~1")
+
+
+def resolve_pointer(data, path):
+    """Get the value referenced by a JSON pointer.
+
+    :param data: Record or any other mapping.
+    :param path: JSON pointer, e.g. ``/authors/0``.
+    :returns: The referenced value.
+    :raises KeyError: If the pointer does not reference a value.
+    """
+    if not path:
+        return data
+    if not path.startswith("/"):
+        raise KeyError(path)
+    for token in path[1:].split("/"):
+        token = token.replace("~1", "/").replace("~0", "~")
+        if isinstance(data, Mapping):
+            data = data[token]
+        elif _is_list(data) and token.isdigit():
+            try:
+                data = data[int(token)]
+            except (IndexError, TypeError):
+                raise KeyError(path)
+        else:
+            raise KeyError(path)
+    return data
+
+
+class RecordContentRenderer(object):
+    """Render record metadata like the ``record_content`` template macro.
+
+    The output has the same markup as the macro of the ``detail.html``
+    template of the theme, without the whitespace between tags. Nested
+    mappings and lists deeper than ``max_depth`` are shown as an ellipsis, and
+    rendering stops with an ellipsis after ``max_nodes`` keys and list items.
+
+    Nested mappings and lists with more than ``collapse`` items are not
+    rendered, but replaced by a link to ``fragment_url(path)``, where
+    ``path`` is the JSON pointer of the content in the record (see
+    :meth:`render_fragment`).
+    """
+
+    def __init__(
+        self,
+        theme="bootstrap3",
+        max_depth=None,
+        max_nodes=None,
+        collapse=None,
+        fragment_url=None,
+    ):
+        """Initialize renderer.
+
+        :param theme: Name of the theme, see :data:`THEMES`.
+        :param max_depth: Maximum nesting depth of mappings and lists.
+            (Default: unlimited)
+        :param max_nodes: Maximum number of keys and list items.
+            (Default: unlimited)
+        :param collapse: Number of items above which nested mappings and lists
+            are collapsed. Requires ``fragment_url``. (Default: never)
+        :param fragment_url: Callable returning the URL of the fragment for a
+            JSON pointer.
+        """
+        self.theme = THEMES[theme]
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.collapse = collapse if fragment_url is not None else None
+        self.fragment_url = fragment_url
+
+    def render(self, data, path=""):
+        """Render record metadata.
+
+        :param data: Record or any other mapping.
+        :param path: JSON pointer of ``data`` in the record.
+        :returns: The HTML as ``markupsafe.Markup``.
+        """
+        self._out = []
+        self._nodes = 0
+        self._truncated = False
+        try:
+            self._mapping(data, 1, path)
+            return Markup("".join(self._out))
+        finally:
+            del self._out
+
+    def render_fragment(self, data, path):
+        """Render the content of a collapsed mapping or list.
+
+        :param data: Record or any other mapping.
+        :param path: JSON pointer of the content in ``data``.
+        :returns: The HTML as ``markupsafe.Markup``.
+        :raises KeyError: If the pointer does not reference a value.
+        """
+        value = resolve_pointer(data, path)
+        if isinstance(value, Mapping):
+            start, end = self.theme["mapping"]
+            return Markup(start) + self.render(value, path) + Markup(end)
+        if not _is_list(value):
+            return escape(value)
+        self._out = ["<ol>"]
+        self._nodes = 0
+        self._truncated = False
+        try:
+            self._list(value, 1, path)
+            self._out.append("</ol>")
+            return Markup("".join(self._out))
+        finally:
+            del self._out
+
+    def _count(self):
+        """Count a node and check if the node limit has been reached."""
+        if self._truncated:
+            return False
+        self._nodes += 1
+        if self.max_nodes is not None and self._nodes > self.max_nodes:
+            self._truncated = True
+            return False
+        return True
+
+    def _mapping(self, data, depth, path):
+        """Render the items of a mapping."""
+        out = self._out
+        item_start, item_end = self.theme["item"]
+        for key, value in data.items():
+            if not self._count():
+                out.extend((item_start, ELLIPSIS, item_end))
+                return
+            out.append(item_start)
+            value_path = "{0}/{1}".format(path, _escape_pointer(key))
+            if isinstance(value, Mapping):
+                out.append(self.theme["mapping_key"].format(escape(key)))
+                if self._descend(depth, value, value_path):
+                    start, end = self.theme["mapping"]
+                    out.append(start)
+                    self._mapping(value, depth + 1, value_path)
+                    out.append(end)
+            elif _is_list(value):
+                out.append("<strong>{0}:</strong>".format(escape(key)))
+                if self._descend(depth, value, value_path):
+                    out.append("<ol>")
+                    self._list(value, depth + 1, value_path)
+                    out.append("</ol>")
+            else:
+                out.append(
+                    "<strong>{0}:</strong> {1}".format(escape(key), escape(value))
+                )
+            out.append(item_end)
+            if self._truncated:
+                return
+
+    def _list(self, data, depth, path):
+        """Render the items of a list."""
+        out = self._out
+        for index, item in enumerate(data):
+            if not self._count():
+                out.append("<li>{0}</li>".format(ELLIPSIS))
+                return
+            out.append("<li>")
+            if isinstance(item, Mapping):
+                item_path = "{0}/{1}".format(path, index)
+                if self._descend(depth, item, item_path):
+                    start, end = self.theme["list_mapping"]
+                    out.append(start)
+                    self._mapping(item, depth + 1, item_path)
+                    out.append(end)
+            else:
+                out.append(escape(item))
+            out.append("</li>")
+            if self._truncated:
+                return
+
+    def _descend(self, depth, value, path):
+        """Check if nested content at a depth is rendered."""
+        if self.max_depth is not None and depth >= self.max_depth:
+            self._out.append(" " + ELLIPSIS)
+            return False
+        if self.collapse is not None:
+            try:
+                size = len(value)
+            except TypeError:
+                return True
+            if size > self.collapse:
+                self._out.append(
+                    PLACEHOLDER.format(escape(self.fragment_url(path)), ELLIPSIS, size)
+                )
+                return False
+        return True
+
+
+def render_record_content(data, theme="bootstrap3", **kwargs):
+    r"""Render record metadata like the ``record_content`` template macro.
+
+    :param data: Record or any other mapping.
+    :param theme: Name of the theme, see :data:`THEMES`.
+    :param \*\*kwargs: Options of :class:`RecordContentRenderer`.
+    :returns: The HTML as ``markupsafe.Markup``.
+    """
+    return RecordContentRenderer(theme=theme, **kwargs).render(data)
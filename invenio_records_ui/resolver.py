@@ -0,0 +1,274 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Persistent identifier resolvers for Invenio-Records-UI."""
+
+from __future__ import absolute_import, print_function
+
+import six
+from flask import current_app
+from invenio_db import db
+from invenio_pidstore.errors import (
+    PersistentIdentifierError,
+    PIDDeletedError,
+    PIDDoesNotExistError,
+    PIDMissingObjectError,
+    PIDRedirectedError,
+    PIDUnregistered,
+)
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus, Redirect
+from invenio_pidstore.resolver import Resolver
+from invenio_records.api import Record
+from sqlalchemy import and_
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.exc import NoResultFound
+
+from .metrics import cache_lookup, timed
+
+
+class RecordResolver(Resolver):
+    """Resolve a persistent identifier and its record in one query.
+
+    The persistent identifier, its redirection target and the record metadata
+    are fetched with a single joined query, instead of one query per object.
+    Errors are raised exactly like in ``invenio_pidstore.resolver.Resolver``,
+    except that the record of a deleted persistent identifier is not fetched
+    if ``RECORDS_UI_TOMBSTONE_LOAD_RECORD`` is off.
+
+    Records are built directly from the fetched metadata, so the ``getter``
+    is only used to find the record class: overrides of ``get_record`` in the
+    record class are bypassed.
+
+    Enable it for an endpoint with:
+
+    .. code-block:: python
+
+        RECORDS_UI_ENDPOINTS = {
+            "recid": {
+                # ...
+                "resolver_imp": "invenio_records_ui.resolver:RecordResolver",
+            },
+        }
+    """
+
+    def __init__(
+        self,
+        pid_type=None,
+        object_type=None,
+        getter=None,
+        registered_only=True,
+        record_class=None,
+    ):
+        """Initialize resolver.
+
+        :param pid_type: Persistent identifier type.
+        :param object_type: Object type.
+        :param getter: The ``get_record`` class method of the record class.
+            Used on cache hits of :class:`CachedResolver` only.
+        :param registered_only: Only resolve registered persistent
+            identifiers.
+        :param record_class: Record API class. (Default: the class the
+            ``getter`` is bound to, or ``invenio_records.api.Record`` if there
+            is no ``getter``)
+        :raises ValueError: If no record class is given and the ``getter`` is
+            not bound to a record class.
+        """
+        super(RecordResolver, self).__init__(
+            pid_type=pid_type,
+            object_type=object_type,
+            getter=getter,
+            registered_only=registered_only,
+        )
+        if record_class is None:
+            record_class = getattr(
+                getter, "__self__", Record if getter is None else None
+            )
+            if not hasattr(record_class, "model_cls"):
+                raise ValueError(
+                    "RecordResolver needs a record class or a getter bound to one."
+                )
+        self.record_class = record_class
+
+    def query(self, pid_value):
+        """Build the query fetching the PID, redirect target and record.
+
+        :param pid_value: Persistent identifier value.
+        :returns: A query of tuples (pid, redirect target, record metadata).
+        """
+        return self._query().filter(
+            PersistentIdentifier.pid_value == six.text_type(pid_value)
+        )
+
+    def _query(self):
+        """Build the query for all persistent identifiers of the type."""
+        model_cls = self.record_class.model_cls
+        target = aliased(PersistentIdentifier)
+        record_join = and_(
+            PersistentIdentifier.object_type == self.object_type,
+            model_cls.id == PersistentIdentifier.object_uuid,
+        )
+        if not current_app.config.get("RECORDS_UI_TOMBSTONE_LOAD_RECORD", True):
+            record_join = and_(
+                record_join, PersistentIdentifier.status != PIDStatus.DELETED
+            )
+        return (
+            db.session.query(PersistentIdentifier, target, model_cls)
+            .outerjoin(
+                Redirect,
+                and_(
+                    PersistentIdentifier.status == PIDStatus.REDIRECTED,
+                    Redirect.id == PersistentIdentifier.object_uuid,
+                ),
+            )
+            .outerjoin(target, target.id == Redirect.pid_id)
+            .outerjoin(model_cls, record_join)
+            .filter(PersistentIdentifier.pid_type == self.pid_type)
+        )
+
+    def resolve(self, pid_value):
+        """Resolve a persistent identifier to an internal object.
+
+        :param pid_value: Persistent identifier.
+        :returns: A tuple containing (pid, object).
+        """
+        with db.session.no_autoflush:
+            row = self.query(pid_value).one_or_none()
+        if row is None:
+            raise PIDDoesNotExistError(self.pid_type, pid_value)
+        return self._resolve_row(*row)
+
+    def resolve_many(self, pid_values):
+        """Resolve several persistent identifiers with one query.
+
+        :param pid_values: Persistent identifier values.
+        :returns: List of tuples (pid_value, result) in the order of
+            ``pid_values``, where the result is either the tuple (pid, record)
+            or the exception :meth:`resolve` raises for the value.
+        """
+        values = [six.text_type(value) for value in pid_values]
+        rows = {}
+        if values:
+            with db.session.no_autoflush:
+                query = self._query().filter(
+                    PersistentIdentifier.pid_value.in_(set(values))
+                )
+                rows = {row[0].pid_value: row for row in query}
+
+        results = []
+        for value in values:
+            try:
+                if value not in rows:
+                    raise PIDDoesNotExistError(self.pid_type, value)
+                results.append((value, self._resolve_row(*rows[value])))
+            except (PersistentIdentifierError, NoResultFound) as e:
+                results.append((value, e))
+        return results
+
+    def _resolve_row(self, pid, target, model):
+        """Resolve a row of the query like :meth:`resolve`."""
+        if (pid.is_new() or pid.is_reserved()) and self.registered_only:
+            raise PIDUnregistered(pid)
+
+        if pid.is_deleted():
+            record = None
+            if model is not None and not model.is_deleted:
+                record = self.record_class(model.data, model=model)
+            raise PIDDeletedError(pid, record)
+
+        if pid.is_redirected():
+            raise PIDRedirectedError(pid, target or pid.get_redirect())
+
+        if not pid.get_assigned_object(object_type=self.object_type):
+            raise PIDMissingObjectError(self.pid_type, pid.pid_value)
+
+        if model is None or model.is_deleted:
+            # Same outcome as ``Record.get_record`` for a missing record.
+            raise NoResultFound()
+        return pid, self.record_class(model.data, model=model)
+
+
+def _timed_getter(getter, pid_type):
+    """Measure the loading of records as the ``load`` phase."""
+
+    def get(*args, **kwargs):
+        with timed("load", pid_type):
+            return getter(*args, **kwargs)
+
+    return get
+
+
+class CachedResolver(object):
+    """Resolver proxy caching resolved persistent identifiers.
+
+    Resolved persistent identifiers are kept in the application's PID cache
+    (see ``RECORDS_UI_PID_CACHE``), so that only the record needs to be
+    fetched on subsequent requests. Only registered persistent identifiers are
+    cached, and entries are dropped when the persistent identifier or its
+    record changes.
+
+    Persistent identifiers which do not exist can be kept in the negative
+    cache (see ``RECORDS_UI_NEGATIVE_CACHE``), so that repeated lookups of
+    them fail without querying the database.
+    """
+
+    def __init__(self, resolver):
+        """Initialize resolver.
+
+        :param resolver: The resolver used on cache misses.
+        """
+        self.resolver = resolver
+        getter = getattr(resolver, "object_getter", None)
+        if getter is not None:
+            resolver.object_getter = _timed_getter(getter, resolver.pid_type)
+
+    def __getattr__(self, name):
+        """Delegate attribute access to the wrapped resolver."""
+        return getattr(self.resolver, name)
+
+    def resolve(self, pid_value):
+        """Resolve a persistent identifier to an internal object.
+
+        :param pid_value: Persistent identifier.
+        :returns: A tuple containing (pid, object).
+        """
+        state = current_app.extensions["invenio-records-ui"]
+        cache = state.pid_cache
+        negative_cache = state.negative_cache
+        if cache is None and negative_cache is None:
+            return self.resolver.resolve(pid_value)
+
+        key = (self.resolver.pid_type, six.text_type(pid_value))
+        if negative_cache is not None and negative_cache.get(key):
+            cache_lookup("pid", True)
+            raise PIDDoesNotExistError(self.resolver.pid_type, pid_value)
+        if cache is not None:
+            values = cache.get(key)
+            cache_lookup("pid", values is not None)
+            if values is not None:
+                pid = PersistentIdentifier(**values)
+                return pid, self.resolver.object_getter(pid.object_uuid)
+
+        try:
+            pid, record = self.resolver.resolve(pid_value)
+        except PIDDoesNotExistError:
+            if negative_cache is not None:
+                negative_cache.set(key, True)
+            raise
+
+        if cache is not None:
+            cache.set(
+                key,
+                dict(
+                    id=pid.id,
+                    pid_type=pid.pid_type,
+                    pid_value=pid.pid_value,
+                    pid_provider=pid.pid_provider,
+                    status=pid.status,
+                    object_type=pid.object_type,
+                    object_uuid=pid.object_uuid,
+                    created=pid.created,
+                    updated=pid.updated,
+                ),
+                tags=[str(pid.object_uuid)],
+            )
+        return pid, record
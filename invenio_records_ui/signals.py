@@ -29,4 +29,9 @@ Example receiver:
 
 Note, the signal is always sent in a request context, thus it is safe to
 access the current request and/or current user objects inside the receiver.
+If ``RECORDS_UI_ASYNC_SIGNALS`` is enabled, the signal is instead sent from a
+worker thread in an application context only: the current request and
+``current_user`` are not available, and the PID and record are detached
+copies. A snapshot of the request, including the user id, is available as
+``flask.g.record_view`` (see :class:`invenio_records_ui.events.RecordView`).
 """
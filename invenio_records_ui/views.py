@@ -5,6 +5,10 @@
 
 from __future__ import absolute_import, print_function
 
+import codecs
+import hashlib
+import threading
+from collections import namedtuple
 from functools import partial
 
 import six
@@ -12,11 +16,18 @@ from flask import (
     Blueprint,
     abort,
     current_app,
+    g,
+    jsonify,
+    make_response,
     redirect,
     render_template,
     request,
+    session,
+    stream_template,
+    stream_with_context,
     url_for,
 )
+from invenio_i18n import get_locale
 from invenio_pidstore.errors import (
     PIDDeletedError,
     PIDDoesNotExistError,
@@ -26,11 +37,16 @@ from invenio_pidstore.errors import (
 )
 from invenio_pidstore.resolver import Resolver
 from invenio_records.api import Record
+from werkzeug.http import is_resource_modified
 from werkzeug.local import LocalProxy
 from werkzeug.routing import BuildError
-from werkzeug.utils import import_string
+from werkzeug.utils import import_string, secure_filename
 
-from .signals import record_viewed
+from .bulk import export_stream, iter_records
+from .events import send_record_viewed
+from .metrics import cache_lookup, metrics_view, server_timing_header, timed
+from .rendering import RecordContentRenderer
+from .resolver import CachedResolver, RecordResolver
 from .utils import obj_or_import_string
 
 current_permission_factory = LocalProxy(
@@ -50,10 +66,24 @@ def create_blueprint_from_app(app):
     :params app: A Flask application.
     :returns: Configured blueprint.
     """
-    return create_blueprint(app.config.get("RECORDS_UI_ENDPOINTS"))
+    blueprint = create_blueprint(
+        app.config.get("RECORDS_UI_ENDPOINTS"),
+        lazy=app.config.get("RECORDS_UI_LAZY_ENDPOINTS", False),
+        batch_endpoints=app.config.get("RECORDS_UI_BATCH_ENDPOINTS"),
+        bulk_export_endpoints=app.config.get("RECORDS_UI_BULK_EXPORT_ENDPOINTS"),
+    )
+    if app.config.get("RECORDS_UI_METRICS_ENDPOINT"):
+        blueprint.add_url_rule(
+            app.config["RECORDS_UI_METRICS_ENDPOINT"],
+            endpoint="metrics",
+            view_func=metrics_view,
+        )
+    return blueprint
 
 
-def create_blueprint(endpoints):
+def create_blueprint(
+    endpoints, lazy=False, batch_endpoints=None, bulk_export_endpoints=None
+):
     """Create Invenio-Records-UI blueprint.
 
     The factory installs one URL route per endpoint defined, and adds an
@@ -61,6 +91,11 @@ def create_blueprint(endpoints):
 
     :param endpoints: Dictionary of endpoints to be installed. See usage
         documentation for further details.
+    :param lazy: Default of the ``lazy`` option of the endpoints.
+    :param batch_endpoints: Dictionary of batch endpoints to be installed, see
+        ``RECORDS_UI_BATCH_ENDPOINTS``.
+    :param bulk_export_endpoints: Dictionary of bulk export endpoints to be
+        installed, see ``RECORDS_UI_BULK_EXPORT_ENDPOINTS``.
     :returns: The initialized blueprint.
     """
     blueprint = Blueprint(
@@ -73,14 +108,41 @@ def create_blueprint(endpoints):
 
     @blueprint.errorhandler(PIDDeletedError)
     def tombstone_errorhandler(error):
-        return (
-            render_template(
-                current_app.config["RECORDS_UI_TOMBSTONE_TEMPLATE"],
-                pid=error.pid,
-                record=error.record or {},
-            ),
-            410,
-        )
+        template = current_app.config["RECORDS_UI_TOMBSTONE_TEMPLATE"]
+        cache = current_app.extensions["invenio-records-ui"].tombstone_cache
+        headers = {}
+        if current_app.config["RECORDS_UI_TOMBSTONE_CACHE_CONTROL"]:
+            headers["Cache-Control"] = current_app.config[
+                "RECORDS_UI_TOMBSTONE_CACHE_CONTROL"
+            ]
+        if cache is None or not _is_shared_page():
+            with timed("render", error.pid.pid_type):
+                page = render_template(
+                    template, pid=error.pid, record=error.record or {}
+                )
+            return page, 410, headers
+
+        pid_key = (error.pid.pid_type, error.pid.pid_value)
+        key = pid_key + (template, _current_locale())
+        page = cache.get(key)
+        cache_lookup("page", page is not None)
+        if page is None:
+            with timed("render", error.pid.pid_type):
+                page = render_template(
+                    template, pid=error.pid, record=error.record or {}
+                )
+            tags = [pid_key]
+            if error.record:
+                tags.append(str(error.record.id))
+            cache.set(key, page, tags=tags)
+        return page, 410, headers
+
+    @blueprint.after_request
+    def add_server_timing(response):
+        value = server_timing_header()
+        if value:
+            response.headers.add("Server-Timing", value)
+        return response
 
     @blueprint.context_processor
     def inject_export_formats():
@@ -88,9 +150,19 @@ def create_blueprint(endpoints):
             export_formats=(current_app.extensions["invenio-records-ui"].export_formats)
         )
 
+    blueprint.add_app_template_filter(record_content_filter, "record_content")
+
     for endpoint, options in (endpoints or {}).items():
+        options = dict(options)
+        options.setdefault("lazy", lazy)
         blueprint.add_url_rule(**create_url_rule(endpoint, **options))
 
+    for endpoint, options in (batch_endpoints or {}).items():
+        blueprint.add_url_rule(**create_batch_url_rule(endpoint, **options))
+
+    for endpoint, options in (bulk_export_endpoints or {}).items():
+        blueprint.add_url_rule(**create_bulk_export_url_rule(endpoint, **options))
+
     return blueprint
 
 
@@ -103,6 +175,11 @@ def create_url_rule(
     view_imp=None,
     record_class=None,
     methods=None,
+    page_cache=False,
+    conditional=False,
+    resolver_imp=None,
+    negotiate=None,
+    lazy=False,
 ):
     """Create Werkzeug URL rule for a specific endpoint.
 
@@ -119,38 +196,202 @@ def create_url_rule(
     :param view_imp: Import path to view function. (Default: ``None``)
     :param record_class: Name of the record API class.
     :param methods: Method allowed for the endpoint.
+    :param page_cache: Cache the rendered page per record revision. The flag is
+        passed on to the view method. (Default: ``False``)
+    :param conditional: Answer conditional requests based on the record
+        revision. (Default: ``False``)
+    :param resolver_imp: Import path to the persistent identifier resolver
+        class. (Default: ``invenio_pidstore.resolver.Resolver``)
+    :param negotiate: Answer requests accepting the mimetype of an export
+        format with the serialized record. (Default: ``True`` for the default
+        view method, ``False`` otherwise)
+    :param lazy: Import the view, permission factory, record and resolver
+        classes on the first request to the endpoint instead of now.
+        (Default: ``False``)
     :returns: A dictionary that can be passed as keywords arguments to
         ``Blueprint.add_url_rule``.
     """
     assert route
     assert pid_type
 
+    options = partial(
+        record_view_options,
+        pid_type,
+        template=template,
+        permission_factory_imp=permission_factory_imp,
+        view_imp=view_imp,
+        record_class=record_class,
+        page_cache=page_cache,
+        conditional=conditional,
+        resolver_imp=resolver_imp,
+        negotiate=negotiate,
+    )
+    if lazy:
+        view_func = LazyRecordView(options)
+    else:
+        view_func = partial(record_view, **options())
+    # Make view well-behaved for Flask-DebugToolbar
+    view_func.__module__ = record_view.__module__
+    view_func.__name__ = record_view.__name__
+    view_func.__qualname__ = record_view.__qualname__
+
+    return dict(
+        endpoint=endpoint,
+        rule=route,
+        view_func=view_func,
+        methods=methods or ["GET"],
+    )
+
+
+def record_view_options(
+    pid_type,
+    template=None,
+    permission_factory_imp=None,
+    view_imp=None,
+    record_class=None,
+    page_cache=False,
+    conditional=False,
+    resolver_imp=None,
+    negotiate=None,
+):
+    """Import the objects the record view of an endpoint is configured with.
+
+    See :func:`create_url_rule` for the parameters.
+
+    :returns: A dictionary of keyword arguments of :func:`record_view`.
+    """
     permission_factory = (
         import_string(permission_factory_imp) if permission_factory_imp else None
     )
     view_method = import_string(view_imp) if view_imp else default_view_method
     record_class = import_string(record_class) if record_class else Record
-    methods = methods or ["GET"]
+    resolver_class = obj_or_import_string(resolver_imp, default=Resolver)
+    if negotiate is None:
+        negotiate = view_method is default_view_method
+    if page_cache:
+        view_method = partial(view_method, page_cache=True)
 
-    view_func = partial(
-        record_view,
-        resolver=Resolver(
-            pid_type=pid_type, object_type="rec", getter=record_class.get_record
+    return dict(
+        resolver=CachedResolver(
+            resolver_class(
+                pid_type=pid_type, object_type="rec", getter=record_class.get_record
+            )
         ),
         template=template or "invenio_records_ui/detail.html",
         permission_factory=permission_factory,
         view_method=view_method,
+        conditional=conditional,
+        negotiate=negotiate,
     )
-    # Make view well-behaved for Flask-DebugToolbar
-    view_func.__module__ = record_view.__module__
-    view_func.__name__ = record_view.__name__
-    view_func.__qualname__ = record_view.__qualname__
+
+
+class LazyRecordView(object):
+    """Record view importing its options on the first request."""
+
+    def __init__(self, options):
+        """Initialize view.
+
+        :param options: Callable returning the keyword arguments of
+            :func:`record_view`, see :func:`record_view_options`.
+        """
+        self.options = options
+        self._view = None
+        self._lock = threading.Lock()
+
+    def __call__(self, **kwargs):
+        """Display record view."""
+        if self._view is None:
+            with self._lock:
+                if self._view is None:
+                    self._view = partial(record_view, **self.options())
+        return self._view(**kwargs)
+
+
+def create_batch_url_rule(
+    endpoint,
+    route=None,
+    pid_type=None,
+    template=None,
+    item_template=None,
+    permission_factory_imp=None,
+    record_class=None,
+    max_size=100,
+    methods=None,
+):
+    """Create Werkzeug URL rule for a batch endpoint.
+
+    See ``RECORDS_UI_BATCH_ENDPOINTS`` for the parameters.
+
+    :returns: A dictionary that can be passed as keywords arguments to
+        ``Blueprint.add_url_rule``.
+    """
+    assert route
+    assert pid_type
+
+    permission_factory = (
+        import_string(permission_factory_imp) if permission_factory_imp else None
+    )
+    record_class = obj_or_import_string(record_class, default=Record)
+    view_func = partial(
+        batch_view,
+        resolver=RecordResolver(
+            pid_type=pid_type, object_type="rec", record_class=record_class
+        ),
+        template=template or "invenio_records_ui/batch.html",
+        item_template=item_template or "invenio_records_ui/batch_item.html",
+        permission_factory=permission_factory,
+        max_size=max_size,
+    )
+    view_func.__module__ = batch_view.__module__
+    view_func.__name__ = batch_view.__name__
+    view_func.__qualname__ = batch_view.__qualname__
 
     return dict(
         endpoint=endpoint,
         rule=route,
         view_func=view_func,
-        methods=methods,
+        methods=methods or ["GET"],
+    )
+
+
+def create_bulk_export_url_rule(
+    endpoint,
+    route=None,
+    pid_type=None,
+    permission_factory_imp=None,
+    record_class=None,
+    batch_size=500,
+    methods=None,
+):
+    """Create Werkzeug URL rule for a bulk export endpoint.
+
+    See ``RECORDS_UI_BULK_EXPORT_ENDPOINTS`` for the parameters.
+
+    :returns: A dictionary that can be passed as keywords arguments to
+        ``Blueprint.add_url_rule``.
+    """
+    assert route
+    assert pid_type
+
+    permission_factory = (
+        import_string(permission_factory_imp) if permission_factory_imp else None
+    )
+    view_func = partial(
+        bulk_export,
+        pid_type=pid_type,
+        permission_factory=permission_factory,
+        record_class=obj_or_import_string(record_class, default=Record),
+        batch_size=batch_size,
+    )
+    view_func.__module__ = bulk_export.__module__
+    view_func.__name__ = bulk_export.__name__
+    view_func.__qualname__ = bulk_export.__qualname__
+
+    return dict(
+        endpoint=endpoint,
+        rule=route,
+        view_func=view_func,
+        methods=methods or ["GET"],
     )
 
 
@@ -160,6 +401,8 @@ def record_view(
     template=None,
     permission_factory=None,
     view_method=None,
+    conditional=False,
+    negotiate=False,
     **kwargs,
 ):
     """Display record view.
@@ -176,10 +419,20 @@ def record_view(
 
     Procedure followed:
 
-    #. PID and record are resolved.
+    #. PID and record are resolved. Redirected PIDs are redirected to the
+       final PID of the redirection chain.
 
     #. Permission are checked.
 
+    #. If ``negotiate`` is set and the ``Accept`` header prefers the
+       ``mimetype`` of an export format of the persistent identifier type
+       over HTML, the record is serialized in that format instead of calling
+       ``view_method``, without rendering templates or sending the
+       ``record_viewed`` signal.
+
+    #. If ``conditional`` is set and the client already holds the current
+       revision of the page, a ``304 Not Modified`` response is sent.
+
     #. ``view_method`` is called.
 
     :param pid_value: Persistent identifier value.
@@ -190,10 +443,22 @@ def record_view(
     :param permission_factory: Permission factory called to check if user has
         enough power to execute the action.
     :param view_method: Function that is called.
+    :param conditional: Send ``ETag`` and ``Last-Modified`` headers and answer
+        conditional requests.
+    :param negotiate: Negotiate the export formats with a ``mimetype``. The
+        responses then carry ``Vary: Accept``.
     :returns: Tuple (pid object, record object).
     """
+    redirect_cache = current_app.extensions["invenio-records-ui"].redirect_cache
+    if redirect_cache is not None:
+        destination = redirect_cache.get((resolver.pid_type, six.text_type(pid_value)))
+        cache_lookup("redirect", destination is not None)
+        if destination is not None:
+            return _redirect_to_pid(*destination)
+
     try:
-        pid, record = resolver.resolve(pid_value)
+        with timed("resolve", resolver.pid_type):
+            pid, record = resolver.resolve(pid_value)
     except (PIDDoesNotExistError, PIDUnregistered):
         abort(404)
     except PIDMissingObjectError as e:
@@ -202,31 +467,20 @@ def record_view(
         )
         abort(500)
     except PIDRedirectedError as e:
-        try:
-            return redirect(
-                url_for(
-                    ".{0}".format(e.destination_pid.pid_type),
-                    pid_value=e.destination_pid.pid_value,
-                )
-            )
-        except BuildError:
-            current_app.logger.exception(
-                "Invalid redirect - pid_type '{0}' endpoint missing.".format(
-                    e.destination_pid.pid_type
-                ),
-                extra={
-                    "pid": e.pid,
-                    "destination_pid": e.destination_pid,
-                },
-            )
-            abort(500)
+        return _redirect_to_pid(
+            *resolve_redirect(e.pid, e.destination_pid),
+            extra={
+                "pid": e.pid,
+                "destination_pid": e.destination_pid,
+            },
+        )
 
     # Check permissions
     permission_factory = permission_factory or current_permission_factory
     if permission_factory:
-        # Note, cannot be done in one line due to overloading of boolean
-        # operations in permission object.
-        if not permission_factory(record).can():
+        with timed("permission", pid.pid_type):
+            allowed = check_permission(permission_factory, pid, record)
+        if not allowed:
             from flask_login import current_user
 
             if not current_user.is_authenticated:
@@ -238,10 +492,350 @@ def record_view(
                 )
             abort(403)
 
-    return view_method(pid, record, template=template, **kwargs)
+    variant = template
+    mimetypes = (
+        current_app.extensions["invenio-records-ui"].export_mimetypes(pid.pid_type)
+        if negotiate
+        else None
+    )
+    if mimetypes:
+        # HTML comes first, so that it wins when preferred equally, e.g. for
+        # browsers accepting */*.
+        mimetype = request.accept_mimetypes.best_match(["text/html"] + list(mimetypes))
+        if mimetype in mimetypes:
+            slug, fmt = mimetypes[mimetype]
+            view_method = partial(_negotiated_export, slug=slug, fmt=fmt)
+            variant = mimetype
+
+    if not conditional or record.revision_id is None:
+        response = view_method(pid, record, template=template, **kwargs)
+        if not mimetypes:
+            return response
+        response = make_response(response)
+        response.vary.add("Accept")
+        return response
+
+    if "format" in (request.view_args or {}):
+        # Unknown and deprecated export formats must not be answered with 304.
+        _get_export_format(pid)
+
+    etag = record_etag(pid, record, template=variant)
+    last_modified = record.updated
+    if request.method in ("GET", "HEAD") and not is_resource_modified(
+        request.environ, etag=etag, last_modified=last_modified
+    ):
+        response = current_app.response_class(status=304)
+    else:
+        response = make_response(view_method(pid, record, template=template, **kwargs))
+    if mimetypes:
+        response.vary.add("Accept")
+    if response.status_code not in (200, 304):
+        return response
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    return response
+
+
+def check_permission(permission_factory, pid, record):
+    """Check if the current identity may view a record.
+
+    The decision is taken from the permission cache, if enabled.
+
+    :param permission_factory: Permission factory of the view.
+    :param pid: PID object.
+    :param record: Record object.
+    :returns: ``True`` if the permission is granted.
+    """
+    cache = current_app.extensions["invenio-records-ui"].permission_cache
+    identity = g.get("identity")
+    if cache is None or identity is None or record.revision_id is None:
+        # Note, cannot be done in one line due to overloading of boolean
+        # operations in permission object.
+        if permission_factory(record).can():
+            return True
+        return False
+
+    key = (
+        frozenset(identity.provides),
+        pid.pid_type,
+        pid.pid_value,
+        record.revision_id,
+        permission_factory,
+    )
+    allowed = cache.get(key)
+    cache_lookup("permission", allowed is not None)
+    if allowed is None:
+        allowed = bool(permission_factory(record).can())
+        cache.set(key, allowed, tags=[str(record.id)])
+    return allowed
+
+
+def resolve_redirect(pid, destination_pid):
+    """Follow a chain of redirected persistent identifiers.
+
+    The final destination is stored in the redirect cache, if enabled, and
+    dropped again as soon as any persistent identifier of the chain changes.
+    Redirection cycles are logged and answered with ``500``.
+
+    :param pid: The redirected PID object.
+    :param destination_pid: The PID object ``pid`` is redirected to.
+    :returns: Tuple (pid_type, pid_value) of the final destination.
+    """
+    chain = [(pid.pid_type, pid.pid_value)]
+    while True:
+        destination = (destination_pid.pid_type, destination_pid.pid_value)
+        if destination in chain:
+            current_app.logger.error(
+                "Invalid redirect - redirection cycle {0}.".format(
+                    " -> ".join(":".join(p) for p in chain + [destination])
+                ),
+                extra={"pid": pid},
+            )
+            abort(500)
+        if not destination_pid.is_redirected():
+            break
+        chain.append(destination)
+        destination_pid = destination_pid.get_redirect()
+    chain.append(destination)
+
+    redirect_cache = current_app.extensions["invenio-records-ui"].redirect_cache
+    if redirect_cache is not None:
+        redirect_cache.set(chain[0], destination, tags=chain)
+    return destination
+
+
+def _redirect_to_pid(pid_type, pid_value, extra=None):
+    """Redirect to the endpoint named after a persistent identifier type.
+
+    :param pid_type: Persistent identifier type of the destination.
+    :param pid_value: Persistent identifier value of the destination.
+    :param extra: Extra logging information in case of errors.
+    :returns: The redirect response.
+    """
+    try:
+        return redirect(
+            url_for(".{0}".format(pid_type), pid_value=pid_value),
+            code=current_app.config["RECORDS_UI_REDIRECT_CODE"],
+        )
+    except BuildError:
+        current_app.logger.exception(
+            "Invalid redirect - pid_type '{0}' endpoint missing.".format(pid_type),
+            extra=extra,
+        )
+        abort(500)
+
+
+BatchItem = namedtuple("BatchItem", "pid_value status pid record location")
+"""Persistent identifier value of a batch request and its outcome."""
+
+
+def batch_view(
+    resolver=None,
+    template=None,
+    item_template=None,
+    permission_factory=None,
+    max_size=100,
+    **kwargs,
+):
+    r"""Display several records.
+
+    The persistent identifier values are taken from the ``pid_value`` query
+    arguments, and resolved with one query. The template is passed the
+    variables ``items``, a list of :data:`BatchItem`, and ``item_template``.
+    With ``format=json``, a JSON envelope of the records rendered with the
+    item template is returned instead.
 
+    :param resolver: A :class:`invenio_records_ui.resolver.RecordResolver`.
+    :param template: Template of the page with all records.
+    :param item_template: Template rendering one record.
+    :param permission_factory: Permission factory called to check if user has
+        enough power to view a record.
+    :param max_size: Maximum number of persistent identifier values.
+    :param \*\*kwargs: Additional view arguments based on URL rule.
+    :returns: The rendered page or the JSON envelope.
+    """
+    pid_values = _pid_values_arg()
+    if not pid_values or len(pid_values) > max_size:
+        abort(400)
+
+    with timed("resolve", resolver.pid_type):
+        results = resolver.resolve_many(pid_values)
+
+    permission_factory = permission_factory or current_permission_factory
+    items = []
+    for pid_value, result in results:
+        items.append(_batch_item(pid_value, result, permission_factory))
+
+    with timed("signals", resolver.pid_type):
+        for item in items:
+            if item.status == 200:
+                send_record_viewed(item.pid, item.record)
+
+    with timed("render", resolver.pid_type):
+        if request.args.get("format") != "json":
+            return render_template(template, items=items, item_template=item_template)
+        hits = []
+        for item in items:
+            hit = dict(pid_value=item.pid_value, status=item.status)
+            if item.status == 200:
+                hit["html"] = render_template(
+                    item_template, pid=item.pid, record=item.record
+                )
+            elif item.location:
+                hit["location"] = item.location
+            hits.append(hit)
+        return jsonify(hits=hits)
+
+
+def bulk_export(
+    pid_type=None,
+    permission_factory=None,
+    record_class=Record,
+    batch_size=500,
+    format=None,
+    **kwargs,
+):
+    r"""Stream many records in one export format.
+
+    The records are selected by the ``pid_value`` query arguments, repeated
+    or comma-separated, or else by the ``start`` and ``end`` query arguments
+    (see :func:`invenio_records_ui.bulk.iter_records`), and are fetched in
+    batches. Records the current user may not view are left out. The
+    ``container`` query argument selects the response format, see
+    :func:`invenio_records_ui.bulk.export_stream`.
+
+    :param pid_type: Persistent identifier type.
+    :param permission_factory: Permission factory called to check if user has
+        enough power to view a record.
+    :param record_class: Record API class.
+    :param batch_size: Number of records fetched at once.
+    :param format: Export format slug, from the URL rule.
+    :param \*\*kwargs: Additional view arguments based on URL rule.
+    :returns: The streamed response.
+    """
+    slug, fmt = _find_export_format(pid_type, format)
+    container = request.args.get("container")
+    if container not in (None, "ndjson", "xml", "zip"):
+        abort(400)
+    pid_values = _pid_values_arg() or None
+    permission_factory = permission_factory or current_permission_factory
+
+    def serialized_records():
+        records = iter_records(
+            pid_type,
+            pid_values=pid_values,
+            start=request.args.get("start"),
+            end=request.args.get("end"),
+            record_class=record_class,
+            batch_size=batch_size,
+        )
+        for pid, record in records:
+            if permission_factory and not check_permission(
+                permission_factory, pid, record
+            ):
+                continue
+            yield pid, serialize_record(pid, record, slug, fmt)
+
+    chunks, mimetype, extension = export_stream(
+        serialized_records(), slug, fmt, container
+    )
+    response = current_app.response_class(
+        stream_with_context(chunks), mimetype=mimetype
+    )
+    response.headers.set(
+        "Content-Disposition",
+        "attachment",
+        filename="{0}-{1}.{2}".format(
+            secure_filename(pid_type), secure_filename(slug), extension
+        ),
+    )
+    return response
+
+
+def _pid_values_arg():
+    """Get the persistent identifier values of the ``pid_value`` arguments.
 
-def default_view_method(pid, record, template=None, **kwargs):
+    :returns: List of the distinct values, repeated or comma-separated.
+    """
+    values = (
+        value.strip()
+        for arg in request.args.getlist("pid_value")
+        for value in arg.split(",")
+    )
+    return list(dict.fromkeys(value for value in values if value))
+
+
+def _batch_item(pid_value, result, permission_factory):
+    """Get the outcome of resolving a persistent identifier of a batch.
+
+    :param pid_value: Persistent identifier value.
+    :param result: Tuple (pid, record) or the exception raised by the
+        resolver.
+    :param permission_factory: Permission factory of the view.
+    :returns: A :data:`BatchItem`.
+    """
+    if isinstance(result, PIDDeletedError):
+        return BatchItem(pid_value, 410, result.pid, None, None)
+    if isinstance(result, PIDRedirectedError):
+        destination = result.destination_pid
+        try:
+            location = url_for(
+                ".{0}".format(destination.pid_type), pid_value=destination.pid_value
+            )
+        except BuildError:
+            location = None
+        return BatchItem(
+            pid_value,
+            current_app.config["RECORDS_UI_REDIRECT_CODE"],
+            result.pid,
+            None,
+            location,
+        )
+    if isinstance(result, PIDMissingObjectError):
+        current_app.logger.error(
+            "No object assigned to {0}.".format(result.pid), extra={"pid": result.pid}
+        )
+        return BatchItem(pid_value, 500, None, None, None)
+    if isinstance(result, Exception):
+        return BatchItem(pid_value, 404, None, None, None)
+
+    pid, record = result
+    if permission_factory:
+        with timed("permission", pid.pid_type):
+            allowed = check_permission(permission_factory, pid, record)
+        if not allowed:
+            from flask_login import current_user
+
+            status = 403 if current_user.is_authenticated else 401
+            return BatchItem(pid_value, status, pid, None, None)
+    return BatchItem(pid_value, 200, pid, record, None)
+
+
+def record_etag(pid, record, template=None):
+    """Compute the entity tag of a record page.
+
+    The tag changes with the record revision and varies by endpoint, template,
+    locale and URL rule arguments (e.g. the export format).
+
+    :param pid: PID object.
+    :param record: Record object.
+    :param template: Template to render.
+    :returns: The entity tag.
+    """
+    view_args = sorted((request.view_args or {}).items())
+    value = "{0}:{1}:{2}:{3}:{4}:{5}:{6}".format(
+        request.endpoint,
+        pid.pid_type,
+        pid.pid_value,
+        record.revision_id,
+        template,
+        _current_locale(),
+        view_args,
+    )
+    return hashlib.sha1(value.encode("utf8")).hexdigest()
+
+
+def default_view_method(pid, record, template=None, page_cache=False, **kwargs):
     r"""Display default view.
 
     Sends record_viewed signal and renders template.
@@ -249,19 +843,154 @@ def default_view_method(pid, record, template=None, **kwargs):
     :param pid: PID object.
     :param record: Record object.
     :param template: Template to render.
+    :param page_cache: Reuse the page rendered for the same record revision.
+        Only pages of anonymous users without flashed messages are cached, so
+        the template must not otherwise vary per user or request.
     :param \*\*kwargs: Additional view arguments based on URL rule.
     :returns: The rendered template.
     """
-    record_viewed.send(
-        current_app._get_current_object(),
-        pid=pid,
-        record=record,
-    )
-    return render_template(
+    with timed("signals", pid.pid_type):
+        send_record_viewed(pid, record)
+    if not page_cache or record.revision_id is None or not _is_shared_page():
+        with timed("render", pid.pid_type):
+            return render_template(
+                template,
+                pid=pid,
+                record=record,
+            )
+
+    cache = current_app.extensions["invenio-records-ui"].page_cache
+    key = (
+        request.endpoint,
+        pid.pid_type,
+        pid.pid_value,
+        record.revision_id,
         template,
-        pid=pid,
-        record=record,
+        _current_locale(),
+    )
+    page = cache.get(key)
+    cache_lookup("page", page is not None)
+    if page is None:
+        with timed("render", pid.pid_type):
+            page = render_template(
+                template,
+                pid=pid,
+                record=record,
+            )
+        cache.set(key, page, tags=[str(record.id)])
+    return page
+
+
+def record_content_filter(data, theme="bootstrap3", pid=None):
+    """Render record metadata in the detail page.
+
+    Template filter equivalent to the ``record_content`` macro of the
+    ``detail.html`` templates, see
+    :class:`invenio_records_ui.rendering.RecordContentRenderer`. The output
+    for a record is memoized per record revision.
+
+    :param data: Record or any other mapping.
+    :param theme: Name of the theme of the markup.
+    :param pid: PID object of the record. Large content is only collapsed
+        (see ``RECORDS_UI_RECORD_CONTENT_COLLAPSE``) if given, and if the
+        ``<pid_type>_fragment`` endpoint exists.
+    :returns: The HTML as ``markupsafe.Markup``.
+    """
+    renderer = _record_content_renderer(theme, pid=pid)
+    cache = current_app.extensions["invenio-records-ui"].record_content_cache
+    revision_id = getattr(data, "revision_id", None)
+    if cache is None or revision_id is None:
+        return renderer.render(data)
+
+    key = (
+        str(data.id),
+        revision_id,
+        theme,
+        renderer.max_depth,
+        renderer.max_nodes,
+        renderer.collapse,
     )
+    html = cache.get(key)
+    if html is None:
+        html = renderer.render(data)
+        cache.set(key, html)
+    return html
+
+
+def _record_content_renderer(theme, pid=None):
+    """Create a renderer of record metadata configured for the application.
+
+    :param theme: Name of the theme of the markup.
+    :param pid: PID object of the rendered record.
+    :returns: A :class:`invenio_records_ui.rendering.RecordContentRenderer`.
+    """
+    collapse = current_app.config["RECORDS_UI_RECORD_CONTENT_COLLAPSE"]
+    fragment_url = None
+    if collapse is not None and pid is not None:
+        endpoint = "invenio_records_ui.{0}_fragment".format(pid.pid_type)
+        if endpoint in current_app.view_functions:
+            fragment_url = partial(_fragment_url, endpoint, pid.pid_value)
+    return RecordContentRenderer(
+        theme=theme,
+        max_depth=current_app.config["RECORDS_UI_RECORD_CONTENT_MAX_DEPTH"],
+        max_nodes=current_app.config["RECORDS_UI_RECORD_CONTENT_MAX_NODES"],
+        collapse=collapse,
+        fragment_url=fragment_url,
+    )
+
+
+def _fragment_url(endpoint, pid_value, path):
+    """Build the URL of a fragment of a record."""
+    return url_for(endpoint, pid_value=pid_value, path=path)
+
+
+def fragment(pid, record, template=None, **kwargs):
+    r"""Record metadata fragment view.
+
+    Renders the content referenced by the JSON pointer given in the ``path``
+    query argument, i.e. the content collapsed in the detail page (see
+    ``RECORDS_UI_RECORD_CONTENT_COLLAPSE``). The markup uses the
+    ``semantic-ui`` theme if it is listed in ``APP_THEME``.
+
+    :param pid: PID object.
+    :param record: Record object.
+    :param template: Ignored.
+    :param \*\*kwargs: Additional view arguments based on URL rule.
+    :returns: The HTML fragment.
+    """
+    theme = (
+        "semantic-ui"
+        if "semantic-ui" in current_app.config.get("APP_THEME", [])
+        else "bootstrap3"
+    )
+    renderer = _record_content_renderer(theme, pid=pid)
+    try:
+        html = renderer.render_fragment(record, request.args.get("path", ""))
+    except KeyError:
+        abort(404)
+    return current_app.response_class(html, mimetype="text/html")
+
+
+def _is_shared_page():
+    """Check if the page of the current request may be shared between users.
+
+    Only pages rendered for anonymous users without pending flashed messages
+    are cached, as any other page may show user-specific content.
+    """
+    if session.get("_flashes"):
+        return False
+    if hasattr(current_app, "login_manager"):
+        from flask_login import current_user
+
+        return not current_user.is_authenticated
+    return True
+
+
+def _current_locale():
+    """Get the locale of the current request, if localization is enabled."""
+    if "babel" not in current_app.extensions:
+        return None
+    return str(get_locale())
 
 
 def export(pid, record, template=None, **kwargs):
@@ -269,26 +998,38 @@ def export(pid, record, template=None, **kwargs):
 
     Serializes record with given format and renders record export template.
 
+    If the serializer provides a ``serialize_iter(pid, record)`` method
+    returning an iterable of chunks, and neither the export cache nor export
+    artifacts are used, the template is streamed to the client chunk by
+    chunk, so that the serialized record is never held in memory as a whole.
+
     :param pid: PID object.
     :param record: Record object.
     :param template: Template to render.
     :param \*\*kwargs: Additional view arguments based on URL rule.
     :return: The rendered template.
     """
-    formats = current_app.config.get("RECORDS_UI_EXPORT_FORMATS", {}).get(pid.pid_type)
-    fmt = formats.get(request.view_args.get("format"))
+    slug, fmt = _get_export_format(pid)
+    serializer = obj_or_import_string(fmt["serializer"])
+    state = current_app.extensions["invenio-records-ui"]
+    if (
+        hasattr(serializer, "serialize_iter")
+        and state.export_cache(pid.pid_type, slug) is None
+        and state.export_artifacts is None
+    ):
+        return current_app.response_class(
+            stream_template(
+                template,
+                pid=pid,
+                record=record,
+                data=_decode_chunks(serializer.serialize_iter(pid, record)),
+                format_title=fmt["title"],
+            )
+        )
 
-    if fmt is False:
-        # If value is set to False, it means it was deprecated.
-        abort(410)
-    elif fmt is None:
-        abort(404)
-    else:
-        serializer = obj_or_import_string(fmt["serializer"])
-        data = serializer.serialize(pid, record)
-        if isinstance(data, six.binary_type):
-            data = data.decode("utf8")
+    data = serialize_record(pid, record, slug, fmt)
 
+    with timed("render", pid.pid_type):
         return render_template(
             template,
             pid=pid,
@@ -296,3 +1037,140 @@ def export(pid, record, template=None, **kwargs):
             data=data,
             format_title=fmt["title"],
         )
+
+
+def export_raw(pid, record, template=None, **kwargs):
+    r"""Record download view.
+
+    Serializes record with given format and sends the serialized record as a
+    file download, without any HTML templating. The response uses the
+    ``mimetype`` (default ``application/octet-stream``) and ``extension``
+    (default: the format slug) of the export format, and supports ranged and
+    conditional requests.
+
+    :param pid: PID object.
+    :param record: Record object.
+    :param template: Ignored.
+    :param \*\*kwargs: Additional view arguments based on URL rule.
+    :return: The serialized record.
+    """
+    slug, fmt = _get_export_format(pid)
+    data = serialize_record(pid, record, slug, fmt).encode("utf8")
+
+    response = current_app.response_class(
+        data, mimetype=fmt.get("mimetype", "application/octet-stream")
+    )
+    response.headers.set(
+        "Content-Disposition",
+        "attachment",
+        filename="{0}.{1}".format(
+            secure_filename(pid.pid_value), fmt.get("extension", slug)
+        ),
+    )
+    return response.make_conditional(
+        request, accept_ranges=True, complete_length=len(data)
+    )
+
+
+def _negotiated_export(pid, record, template=None, slug=None, fmt=None, **kwargs):
+    r"""Send a record serialized in the export format chosen by the client.
+
+    :param pid: PID object.
+    :param record: Record object.
+    :param template: Ignored.
+    :param slug: Export format slug.
+    :param fmt: Export format options from ``RECORDS_UI_EXPORT_FORMATS``.
+    :param \*\*kwargs: Additional view arguments based on URL rule.
+    :return: The serialized record.
+    """
+    return current_app.response_class(
+        serialize_record(pid, record, slug, fmt), mimetype=fmt["mimetype"]
+    )
+
+
+def _get_export_format(pid):
+    """Get the export format given in the URL rule arguments.
+
+    Aborts with ``404`` for unknown and ``410`` for deprecated formats.
+
+    :param pid: PID object.
+    :returns: Tuple (format slug, format options).
+    """
+    return _find_export_format(pid.pid_type, request.view_args.get("format"))
+
+
+def _find_export_format(pid_type, slug):
+    """Get an export format of a persistent identifier type.
+
+    Aborts with ``404`` for unknown and ``410`` for deprecated formats.
+
+    :param pid_type: Persistent identifier type.
+    :param slug: Export format slug.
+    :returns: Tuple (format slug, format options).
+    """
+    formats = current_app.config.get("RECORDS_UI_EXPORT_FORMATS", {}).get(pid_type)
+    fmt = (formats or {}).get(slug)
+
+    if fmt is False:
+        # If value is set to False, it means it was deprecated.
+        abort(410)
+    elif fmt is None:
+        abort(404)
+    return slug, fmt
+
+
+def serialize_record(pid, record, slug, fmt):
+    """Serialize a record in an export format.
+
+    The output is taken from the export artifacts of the record revision, if
+    ``RECORDS_UI_EXPORT_ARTIFACTS`` is enabled, or else from the export cache
+    if the format enables it.
+
+    :param pid: PID object.
+    :param record: Record object.
+    :param slug: Export format slug.
+    :param fmt: Export format options from ``RECORDS_UI_EXPORT_FORMATS``.
+    :returns: The serialized record as text.
+    """
+    state = current_app.extensions["invenio-records-ui"]
+    artifacts = state.export_artifacts
+    if artifacts is not None and record.revision_id is not None:
+        data = artifacts.store.get(
+            pid.pid_type, pid.pid_value, slug, record.revision_id
+        )
+        cache_lookup("artifact", data is not None)
+        if data is not None:
+            return data
+
+    cache = state.export_cache(pid.pid_type, slug)
+    if cache is not None and record.revision_id is not None:
+        key = (pid.pid_type, pid.pid_value, slug, record.revision_id)
+        data = cache.get(key)
+        cache_lookup("export", data is not None)
+        if data is not None:
+            return data
+    else:
+        cache = None
+
+    serializer = obj_or_import_string(fmt["serializer"])
+    with timed("serialize", pid.pid_type):
+        data = serializer.serialize(pid, record)
+    if isinstance(data, six.binary_type):
+        data = data.decode("utf8")
+
+    if cache is not None:
+        cache.set(key, data, tags=[str(record.id)])
+    return data
+
+
+def _decode_chunks(chunks):
+    """Decode an iterable of serialized chunks to text."""
+    decoder = codecs.getincrementaldecoder("utf8")()
+    for chunk in chunks:
+        if isinstance(chunk, six.binary_type):
+            chunk = decoder.decode(chunk)
+        if chunk:
+            yield chunk
+    chunk = decoder.decode(b"", final=True)
+    if chunk:
+        yield chunk
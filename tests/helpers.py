@@ -15,3 +15,16 @@ def only_authenticated_users(record, *args, **kwargs):
         return current_user.is_authenticated
 
     return type("OnlyAuthenticatedUsers", (), {"can": can})()
+
+
+permission_checks = []
+
+
+def counted_permission(record, *args, **kwargs):
+    """Allow access to anyone and count the permission checks."""
+
+    def can(self):
+        permission_checks.append(record["title"])
+        return True
+
+    return type("CountedPermission", (), {"can": can})()
@@ -7,21 +7,44 @@
 
 from __future__ import absolute_import, print_function
 
+import io
+import json
+import re
 import uuid
-
-from flask import Flask, request, url_for
+import zipfile
+
+import pytest
+from flask import (
+    Flask,
+    g,
+    has_request_context,
+    render_template_string,
+    request,
+    url_for,
+)
+from flask_login import LoginManager
 from flask_menu import Menu
+from flask_principal import Identity, Principal, UserNeed
 from flask_security.utils import encrypt_password
+from helpers import permission_checks
 from invenio_access import InvenioAccess
 from invenio_accounts import InvenioAccounts
 from invenio_accounts.views.settings import create_settings_blueprint
 from invenio_db import db
 from invenio_i18n import InvenioI18N
+from invenio_pidstore.errors import PIDDeletedError
 from invenio_pidstore.models import PersistentIdentifier, PIDStatus
 from invenio_pidstore.resolver import Resolver
 from invenio_records.api import Record
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy import event
 
 from invenio_records_ui import InvenioRecordsUI
+from invenio_records_ui.cli import records_ui
+from invenio_records_ui.events import AsyncSignalDispatcher, JSONLinesSink
+from invenio_records_ui.ext import finalize_app
+from invenio_records_ui.rendering import render_record_content
+from invenio_records_ui.resolver import RecordResolver
 from invenio_records_ui.signals import record_viewed
 from invenio_records_ui.views import create_blueprint_from_app
 
@@ -85,6 +108,15 @@ def setup_record_fixture(app):
         db.session.commit()
 
 
+def update_record_fixture(pid_value, **changes):
+    """Update a record of the record fixture."""
+    pid = PersistentIdentifier.get("recid", pid_value)
+    record = Record.get_record(pid.object_uuid)
+    record.update(changes)
+    record.commit()
+    db.session.commit()
+
+
 def test_version():
     """Test version import."""
     from invenio_records_ui import __version__
@@ -369,3 +401,1097 @@ def test_default_export_format(app, json_v1):
         )
     ]
     assert default_format == record_ui_state.export_formats("recid")
+
+
+def test_page_cache(app):
+    """Test caching of rendered pages."""
+    app.config.update(
+        RECORDS_UI_ENDPOINTS=dict(
+            recid=dict(
+                pid_type="recid",
+                route="/records/<pid_value>",
+                page_cache=True,
+            ),
+        ),
+    )
+    InvenioRecordsUI(app)
+    app.secret_key = "CHANGEME"
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+    cache = app.extensions["invenio-records-ui"].page_cache
+
+    with app.test_client() as client:
+        res = client.get("/records/1")
+        assert res.status_code == 200
+        assert len(cache) == 1
+        res = client.get("/records/1")
+        assert res.status_code == 200
+        assert cache.hits == 1
+
+    # Updating the record drops the cached page.
+    update_record_fixture("1", title="Updated")
+    assert len(cache) == 0
+
+    with app.test_client() as client:
+        res = client.get("/records/1")
+        assert "Updated" in res.get_data(as_text=True)
+        assert len(cache) == 1
+
+    # Pages with flashed messages are not shared.
+    with app.test_client() as client:
+        with client.session_transaction() as sess:
+            sess["_flashes"] = [("message", "Flashed")]
+        assert client.get("/records/1").status_code == 200
+        assert cache.hits == 1
+
+
+def test_conditional_requests(app, json_v1, monkeypatch):
+    """Test ETag and Last-Modified handling."""
+    app.config.update(
+        RECORDS_UI_ENDPOINTS=dict(
+            recid=dict(
+                pid_type="recid",
+                route="/records/<pid_value>",
+                conditional=True,
+            ),
+            recid_export=dict(
+                pid_type="recid",
+                route="/records/<pid_value>/export/<format>",
+                view_imp="invenio_records_ui.views.export",
+                template="invenio_records_ui/export.html",
+                conditional=True,
+            ),
+        ),
+        RECORDS_UI_EXPORT_FORMATS=dict(
+            recid=dict(
+                json=dict(title="JSON", serializer=json_v1, order=1),
+                json2=dict(title="JSON", serializer=json_v1, order=2),
+                json_old=False,
+            )
+        ),
+    )
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+
+    with app.test_client() as client:
+        res = client.get("/records/1")
+        assert res.status_code == 200
+        etag = res.headers["ETag"]
+        last_modified = res.headers["Last-Modified"]
+
+        res = client.get("/records/1", headers={"If-None-Match": etag})
+        assert res.status_code == 304
+        assert res.headers["ETag"] == etag
+
+        res = client.get("/records/1", headers={"If-Modified-Since": last_modified})
+        assert res.status_code == 304
+
+        # The tag varies by export format.
+        res1 = client.get("/records/1/export/json")
+        res2 = client.get("/records/1/export/json2")
+        assert res1.headers["ETag"] != res2.headers["ETag"]
+        assert res1.headers["ETag"] != etag
+
+        # Unknown and deprecated formats are never answered with 304.
+        headers = {"If-Modified-Since": last_modified}
+        assert client.get("/records/1/export/foo", headers=headers).status_code == 404
+        res = client.get("/records/1/export/json_old", headers=headers)
+        assert res.status_code == 410
+
+        # The tag varies by locale.
+        monkeypatch.setattr("invenio_records_ui.views._current_locale", lambda: "de")
+        res = client.get("/records/1", headers={"If-None-Match": etag})
+        assert res.status_code == 200
+        assert res.headers["ETag"] != etag
+        monkeypatch.undo()
+
+    # A new revision invalidates the tag.
+    update_record_fixture("1", title="Updated")
+
+    with app.test_client() as client:
+        res = client.get("/records/1", headers={"If-None-Match": etag})
+        assert res.status_code == 200
+
+
+def test_export_cache(app, json_v1):
+    """Test caching of serialized exports."""
+    calls = []
+
+    class CountingSerializer(object):
+        def serialize(self, pid, record):
+            calls.append(pid.pid_value)
+            return json_v1.serialize(pid, record)
+
+    app.config.update(
+        RECORDS_UI_EXPORT_FORMATS=dict(
+            recid=dict(
+                json=dict(
+                    title="JSON",
+                    serializer=CountingSerializer(),
+                    order=1,
+                    cache=dict(maxsize=10, timeout=60),
+                ),
+                nocache=dict(
+                    title="JSON",
+                    serializer=CountingSerializer(),
+                    order=2,
+                ),
+            )
+        )
+    )
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+    state = app.extensions["invenio-records-ui"]
+    assert state.export_cache("recid", "nocache") is None
+
+    with app.test_client() as client:
+        for dummy in range(2):
+            res = client.get("/records/1/export/json")
+            assert res.status_code == 200
+        assert len(calls) == 1
+        for dummy in range(2):
+            client.get("/records/1/export/nocache")
+        assert len(calls) == 3
+
+    update_record_fixture("1", title="Updated")
+    assert len(state.export_cache("recid", "json")) == 0
+
+    with app.test_client() as client:
+        res = client.get("/records/1/export/json")
+        assert "Updated" in res.get_data(as_text=True)
+        assert len(calls) == 4
+
+
+def test_export_streaming(app):
+    """Test streaming of exports from chunked serializers."""
+
+    class ChunkedSerializer(object):
+        def serialize(self, pid, record):
+            return "".join(self.serialize_iter(pid, record))
+
+        def serialize_iter(self, pid, record):
+            yield b"<record>"
+            for key in sorted(record):
+                yield "<{0}/>".format(key).encode("utf8")
+            # Multi-byte character split across chunks.
+            yield "é".encode("utf8")[:1]
+            yield "é".encode("utf8")[1:]
+            yield "</record>"
+
+    app.config.update(
+        RECORDS_UI_EXPORT_FORMATS=dict(
+            recid=dict(
+                xml=dict(title="XML", serializer=ChunkedSerializer(), order=1),
+            )
+        )
+    )
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+
+    with app.test_client() as client:
+        res = client.get("/records/1/export/xml")
+        assert res.status_code == 200
+        assert res.is_streamed
+        data = res.get_data(as_text=True)
+        assert (
+            "&lt;record&gt;&lt;recid/&gt;&lt;title/&gt;é&lt;/record&gt;</pre>" in data
+        )
+
+
+def test_export_raw(app, json_v1):
+    """Test raw download of record exports."""
+    app.config.update(
+        RECORDS_UI_EXPORT_FORMATS=dict(
+            recid=dict(
+                json=dict(
+                    title="JSON",
+                    serializer=json_v1,
+                    order=1,
+                    mimetype="application/json",
+                ),
+                old=False,
+            )
+        )
+    )
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+
+    with app.test_client() as client:
+        res = client.get("/records/1/export/json/raw")
+        assert res.status_code == 200
+        assert res.mimetype == "application/json"
+        assert res.headers["Content-Disposition"] == "attachment; filename=1.json"
+        data = res.get_data()
+        assert res.content_length == len(data)
+        assert json.loads(data)["title"] == "Registered"
+
+        res = client.get("/records/1/export/json/raw", headers={"Range": "bytes=0-0"})
+        assert res.status_code == 206
+        assert res.get_data() == b"{"
+
+        assert client.get("/records/1/export/old/raw").status_code == 410
+        assert client.get("/records/1/export/none/raw").status_code == 404
+        assert client.get("/records/2/export/json/raw").status_code == 410
+
+
+def test_content_negotiation(app, json_v1):
+    """Test negotiating export formats on the record endpoints."""
+    app.config.update(
+        RECORDS_UI_ENDPOINTS=dict(
+            recid=dict(
+                pid_type="recid",
+                route="/records/<pid_value>",
+                conditional=True,
+            ),
+            recid_plain=dict(
+                pid_type="recid",
+                route="/plain/<pid_value>",
+                negotiate=False,
+            ),
+        ),
+        RECORDS_UI_EXPORT_FORMATS=dict(
+            recid=dict(
+                json=dict(
+                    title="JSON",
+                    serializer=json_v1,
+                    order=1,
+                    mimetype="application/json",
+                ),
+                nomime=dict(title="JSON", serializer=json_v1, order=2),
+                old=False,
+            )
+        ),
+    )
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+
+    viewed = []
+
+    def _signal_sent(app, record=None, pid=None):
+        viewed.append(pid.pid_value)
+
+    with app.test_client() as client, record_viewed.connected_to(_signal_sent):
+        res = client.get("/records/1", headers={"Accept": "application/json"})
+        assert res.status_code == 200
+        assert res.mimetype == "application/json"
+        assert "Accept" in res.vary
+        assert "Content-Disposition" not in res.headers
+        assert json.loads(res.get_data())["title"] == "Registered"
+        assert viewed == []
+        etag = res.headers["ETag"]
+
+        res = client.get(
+            "/records/1",
+            headers={"Accept": "application/json", "If-None-Match": etag},
+        )
+        assert res.status_code == 304
+        assert "Accept" in res.vary
+
+        # HTML wins when preferred or accepted equally.
+        for accept in (
+            None,
+            "text/html,application/xhtml+xml,*/*;q=0.8",
+            "*/*",
+            "application/xml",
+        ):
+            headers = {"Accept": accept} if accept else {}
+            res = client.get("/records/1", headers=headers)
+            assert res.status_code == 200
+            assert res.mimetype == "text/html"
+            assert "Accept" in res.vary
+            assert res.headers["ETag"] != etag
+        assert viewed == ["1"] * 4
+
+        res = client.get(
+            "/records/1", headers={"Accept": "text/html;q=0.5,application/json"}
+        )
+        assert res.mimetype == "application/json"
+
+        # Tombstones and unknown PIDs are unaffected.
+        headers = {"Accept": "application/json"}
+        assert client.get("/records/2", headers=headers).status_code == 410
+        assert client.get("/records/99", headers=headers).status_code == 404
+
+        res = client.get("/plain/1", headers=headers)
+        assert res.mimetype == "text/html"
+        assert "Accept" not in res.vary
+
+
+def test_record_resolver(app):
+    """Test resolving PIDs and records with a single query."""
+    app.config.update(
+        PIDSTORE_DATACITE_DOI_PREFIX="10.4321",
+        RECORDS_UI_ENDPOINTS=dict(
+            recid=dict(
+                pid_type="recid",
+                route="/records/<pid_value>",
+                resolver_imp="invenio_records_ui.resolver:RecordResolver",
+            ),
+            doi=dict(
+                pid_type="doi",
+                route="/doi/<path:pid_value>",
+                resolver_imp=RecordResolver,
+            ),
+        ),
+    )
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+
+    with app.test_client() as client:
+        assert client.get("/records/1").status_code == 200
+        assert client.get("/records/2").status_code == 410
+        assert client.get("/records/3").status_code == 410
+        assert client.get("/records/4").status_code == 500
+        res = client.get("/records/5")
+        assert res.status_code == 302
+        assert res.location.endswith("/records/1")
+        assert client.get("/records/6").status_code == 302
+        assert client.get("/records/7").status_code == 404
+        assert client.get("/records/8").status_code == 404
+        assert client.get("/doi/10.1234/foo").status_code == 200
+
+    resolver = RecordResolver(
+        pid_type="recid", object_type="rec", getter=Record.get_record
+    )
+    assert resolver.record_class is Record
+    with pytest.raises(PIDDeletedError) as excinfo:
+        resolver.resolve("2")
+    assert excinfo.value.record["title"] == "Live "
+    pid, record = resolver.resolve("1")
+    assert record.revision_id == 0
+    assert pid.pid_value == "1"
+
+    # Getters not bound to a record class cannot be used.
+    with pytest.raises(ValueError):
+        RecordResolver(pid_type="recid", getter=lambda uuid: None)
+
+
+def test_pid_cache(app):
+    """Test caching of resolved persistent identifiers."""
+    app.config.update(RECORDS_UI_PID_CACHE=True)
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+    state = app.extensions["invenio-records-ui"]
+    cache = state.pid_cache
+
+    with app.test_client() as client:
+        for dummy in range(3):
+            res = client.get("/records/1")
+            assert res.status_code == 200
+            assert "Registered" in res.get_data(as_text=True)
+        assert (cache.misses, cache.hits) == (1, 2)
+        # Errors are not cached.
+        client.get("/records/2")
+        client.get("/records/2")
+        assert len(cache) == 1
+
+    # Changing the PID drops the entry, and again once committed.
+    PersistentIdentifier.get("recid", "1").delete()
+    db.session.flush()
+    assert len(cache) == 0
+    # E.g. cached by a concurrent request before the commit.
+    cache.set(("recid", "1"), {})
+    db.session.commit()
+    assert len(cache) == 0
+    with app.test_client() as client:
+        assert client.get("/records/1").status_code == 410
+
+    # Explicit invalidation.
+    state.pid_cache.set(("recid", "8"), {})
+    state.invalidate_pid("recid", "8")
+    assert len(cache) == 0
+
+
+def test_negative_cache(app):
+    """Test caching of lookups of unknown persistent identifiers."""
+    app.config.update(RECORDS_UI_NEGATIVE_CACHE=True)
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+    cache = app.extensions["invenio-records-ui"].negative_cache
+
+    with app.test_client() as client:
+        assert client.get("/records/100").status_code == 404
+        assert client.get("/records/100").status_code == 404
+        assert cache.hits == 1
+        # Unregistered PIDs exist and are not cached.
+        assert client.get("/records/7").status_code == 404
+        assert len(cache) == 1
+
+    # Creating the PID drops the entry.
+    rec_uuid = uuid.uuid4()
+    Record.create({"title": "New"}, id_=rec_uuid)
+    PersistentIdentifier.create(
+        "recid",
+        "100",
+        object_type="rec",
+        object_uuid=rec_uuid,
+        status=PIDStatus.REGISTERED,
+    )
+    db.session.commit()
+    assert len(cache) == 0
+    with app.test_client() as client:
+        assert client.get("/records/100").status_code == 200
+
+
+def test_redirect_chain(app):
+    """Test collapsing and caching of redirect chains."""
+    app.config.update(RECORDS_UI_REDIRECT_CACHE=True, RECORDS_UI_REDIRECT_CODE=301)
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+    cache = app.extensions["invenio-records-ui"].redirect_cache
+
+    # Record 8 - Redirected to the redirected PID 5
+    pid = PersistentIdentifier.create("recid", "8", status=PIDStatus.REGISTERED)
+    pid.redirect(PersistentIdentifier.get("recid", "5"))
+    db.session.commit()
+
+    with app.test_client() as client:
+        res = client.get("/records/8")
+        assert res.status_code == 301
+        assert res.location.endswith("/records/1")
+        assert cache.get(("recid", "8")) == ("recid", "1")
+        res = client.get("/records/8")
+        assert res.status_code == 301
+
+    # Changing any PID of the chain drops the cached redirect.
+    PersistentIdentifier.get("recid", "5").redirect(
+        PersistentIdentifier.get("doi", "10.1234/foo")
+    )
+    db.session.commit()
+    assert cache.get(("recid", "8")) is None
+    with app.test_client() as client:
+        # The destination has no endpoint.
+        assert client.get("/records/8").status_code == 500
+
+    # Redirection cycles are errors, and are not cached.
+    PersistentIdentifier.get("recid", "5").redirect(
+        PersistentIdentifier.get("recid", "8")
+    )
+    db.session.commit()
+    with app.test_client() as client:
+        assert client.get("/records/8").status_code == 500
+        assert client.get("/records/5").status_code == 500
+    assert len(cache) == 0
+
+
+def test_tombstone_cache(app):
+    """Test caching of tombstones."""
+    app.config.update(
+        RECORDS_UI_TOMBSTONE_CACHE=True,
+        RECORDS_UI_TOMBSTONE_CACHE_CONTROL="public, max-age=60",
+        RECORDS_UI_TOMBSTONE_LOAD_RECORD=False,
+        RECORDS_UI_ENDPOINTS=dict(
+            recid=dict(
+                pid_type="recid",
+                route="/records/<pid_value>",
+                resolver_imp=RecordResolver,
+            ),
+        ),
+    )
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+    cache = app.extensions["invenio-records-ui"].tombstone_cache
+
+    with app.test_client() as client:
+        for dummy in range(2):
+            res = client.get("/records/2")
+            assert res.status_code == 410
+            assert res.headers["Cache-Control"] == "public, max-age=60"
+            # The record is not loaded.
+            assert "Live" not in res.get_data(as_text=True)
+        assert cache.hits == 1
+        assert client.get("/records/3").status_code == 410
+        assert len(cache) == 2
+
+    # Tombstones with flashed messages are not shared.
+    app.secret_key = "CHANGEME"
+    with app.test_client() as client:
+        with client.session_transaction() as sess:
+            sess["_flashes"] = [("message", "Flashed")]
+        assert client.get("/records/2").status_code == 410
+        assert cache.hits == 1
+
+    # Changing the PID drops the tombstone.
+    pid = PersistentIdentifier.get("recid", "3")
+    pid.status = PIDStatus.REGISTERED
+    db.session.commit()
+    assert len(cache) == 1
+
+
+def test_async_signal(app):
+    """Test asynchronous delivery of record views."""
+    app.config.update(RECORDS_UI_ASYNC_SIGNALS=True)
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+    dispatcher = app.extensions["invenio-records-ui"].signal_dispatcher
+    views = []
+
+    def _signal_sent(app, record=None, pid=None):
+        views.append((pid, record, has_request_context(), g.record_view))
+
+    with record_viewed.connected_to(_signal_sent):
+        with app.test_client() as client:
+            res = client.get("/records/1", headers={"User-Agent": "bot"})
+            assert res.status_code == 200
+        dispatcher.flush()
+
+    assert len(views) == 1
+    pid, record, in_request, view = views[0]
+    assert pid.pid_value == "1"
+    assert pid not in db.session
+    assert record.model is None
+    assert record["title"] == "Registered"
+    assert not in_request
+    assert view.user_agent == "bot"
+    assert view.user_id is None
+    assert view.revision_id == 0
+    assert dispatcher.sent == 1
+    dispatcher.shutdown()
+
+    # A full queue drops views.
+    dispatcher = AsyncSignalDispatcher(app, workers=0, queue_size=1)
+    with app.test_request_context("/records/1"):
+        for dummy in range(2):
+            dispatcher.dispatch(PersistentIdentifier(pid_value="1"), Record({}))
+    assert dispatcher.dropped == 1
+    dispatcher.shutdown(timeout=0)
+
+
+def test_view_event_buffer(app, tmp_path):
+    """Test buffering of record view events."""
+    events = []
+    app.config.update(
+        RECORDS_UI_VIEW_EVENT_SINK=events.extend,
+        RECORDS_UI_VIEW_EVENT_FLUSH_INTERVAL=3600,
+    )
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+    buffer = app.extensions["invenio-records-ui"].view_event_buffer
+
+    with app.test_client() as client:
+        for dummy in range(3):
+            assert client.get("/records/1").status_code == 200
+        client.get("/records/1", headers={"User-Agent": "bot"})
+        client.get("/records/2")
+    assert len(buffer) == 2
+    assert events == []
+
+    buffer.flush()
+    assert len(buffer) == 0
+    assert sorted((e.pid_type, e.pid_value, e.count) for e in events) == [
+        ("recid", "1", 1),
+        ("recid", "1", 3),
+    ]
+    assert len(set(e.session_hash for e in events)) == 2
+
+    # Events are kept if the sink fails.
+    def failing_sink(events):
+        raise IOError()
+
+    buffer.sink = failing_sink
+    with app.test_client() as client:
+        client.get("/records/1")
+    buffer.flush()
+    assert len(buffer) == 1
+
+    buffer.sink = JSONLinesSink(str(tmp_path / "views.jsonl"))
+    buffer.shutdown()
+    with open(str(tmp_path / "views.jsonl")) as fp:
+        lines = [json.loads(line) for line in fp]
+    assert lines[0]["pid_value"] == "1"
+    assert lines[0]["count"] == 1
+
+
+def test_permission_cache(app):
+    """Test caching of permission decisions."""
+    app.config.update(
+        RECORDS_UI_PERMISSION_CACHE=True,
+        RECORDS_UI_ENDPOINTS=dict(
+            recid=dict(
+                pid_type="recid",
+                route="/records/<pid_value>",
+                permission_factory_imp="helpers:counted_permission",
+            ),
+        ),
+    )
+    principal = Principal(app, use_sessions=False)
+
+    @principal.identity_loader
+    def load_identity():
+        user_id = request.headers.get("X-User")
+        if user_id:
+            identity = Identity(user_id)
+            identity.provides.add(UserNeed(user_id))
+            return identity
+
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+    del permission_checks[:]
+
+    with app.test_client() as client:
+        for dummy in range(3):
+            assert client.get("/records/1").status_code == 200
+    assert permission_checks == ["Registered"]
+
+    # A new revision is checked again.
+    update_record_fixture("1", title="Updated")
+    with app.test_client() as client:
+        assert client.get("/records/1").status_code == 200
+    assert permission_checks == ["Registered", "Updated"]
+
+    # Other identities are checked separately.
+    with app.test_client() as client:
+        for dummy in range(2):
+            res = client.get("/records/1", headers={"X-User": "1"})
+            assert res.status_code == 200
+    assert len(permission_checks) == 3
+
+
+@pytest.mark.parametrize(
+    "theme,template",
+    [
+        ("bootstrap3", "invenio_records_ui/detail.html"),
+        ("semantic-ui", "semantic-ui/invenio_records_ui/detail.html"),
+    ],
+)
+def test_record_content(app, theme, template):
+    """Test rendering of record metadata like the template macro."""
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    data = {
+        "title": "<b>Title</b>",
+        "number": 1.5,
+        "empty": None,
+        "authors": [{"name": "Ellis", "ids": ["a", "b"]}, "Smith", ["x", "y"]],
+        "meta": {"tags": ["t1"], "nested": {"deep": True}, "none": {}},
+    }
+
+    def normalize(html):
+        return re.sub(r"\s*(<[^>]+>)\s*", r"\1", " ".join(html.split()))
+
+    with app.test_request_context():
+        expected = render_template_string(
+            "{% from '" + template + "' import record_content with context %}"
+            "{{ record_content(data) }}",
+            data=data,
+            pid=PersistentIdentifier(pid_type="recid", pid_value="1"),
+            record={},
+        )
+        html = render_record_content(data, theme=theme)
+    assert "&lt;b&gt;" in html
+    assert normalize(html) == normalize(expected)
+
+    html = render_record_content(data, theme=theme, max_depth=1)
+    assert "Ellis" not in html
+    assert "…" in html
+    html = render_record_content(data, theme=theme, max_nodes=3)
+    assert "Title" in html
+    assert "Smith" not in html
+
+    # The rendered metadata is memoized per record revision.
+    setup_record_fixture(app)
+    cache = app.extensions["invenio-records-ui"].record_content_cache
+    with app.test_client() as client:
+        for dummy in range(2):
+            res = client.get("/records/1")
+            assert "Registered" in res.get_data(as_text=True)
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_record_fragments(app):
+    """Test collapsing of large metadata into fragments."""
+    app.config.update(RECORDS_UI_RECORD_CONTENT_COLLAPSE=2)
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+    update_record_fixture(
+        "1",
+        authors=[{"name": "Ellis"}, {"name": "Smith"}, {"name": "Jones"}],
+        meta={"a/b": {"x": 1, "y": 2, "z": 3}},
+    )
+
+    with app.test_client() as client:
+        html = client.get("/records/1").get_data(as_text=True)
+        assert "Ellis" not in html
+        assert "/records/1/fragment?path=/authors" in html
+        assert "/records/1/fragment?path=/meta/a~1b" in html
+
+        res = client.get("/records/1/fragment?path=/authors")
+        assert res.status_code == 200
+        assert res.get_data(as_text=True).startswith("<ol>")
+        assert "Jones" in res.get_data(as_text=True)
+        res = client.get("/records/1/fragment?path=/authors/1/name")
+        assert res.get_data(as_text=True) == "Smith"
+        res = client.get("/records/1/fragment?path=/meta/a~1b")
+        assert "<strong>z:</strong> 3" in res.get_data(as_text=True)
+
+        assert client.get("/records/1/fragment?path=/nope").status_code == 404
+        assert client.get("/records/1/fragment?path=/authors/9").status_code == 404
+        # Fragments use the same resolution as the record page.
+        assert client.get("/records/2/fragment?path=/title").status_code == 410
+
+
+def test_template_warmup(app, tmp_path):
+    """Test compiling the templates at startup."""
+    app.config.update(
+        RECORDS_UI_TEMPLATE_WARMUP=True,
+        RECORDS_UI_TEMPLATE_BYTECODE_CACHE=str(tmp_path),
+    )
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    finalize_app(app)
+    assert isinstance(app.jinja_env.bytecode_cache, FileSystemBytecodeCache)
+    cached = [key[1] for key in app.jinja_env.cache.keys()]
+    for name in (
+        "invenio_records_ui/detail.html",
+        "invenio_records_ui/base.html",
+        "invenio_records_ui/export.html",
+        "invenio_records_ui/tombstone.html",
+    ):
+        assert name in cached
+    assert len(list(tmp_path.iterdir())) >= 4
+
+    result = app.test_cli_runner().invoke(records_ui, ["warmup"])
+    assert result.exit_code == 0
+    assert "invenio_records_ui/detail.html" in result.output
+
+
+def test_lazy_endpoints(app):
+    """Test importing the endpoint options on the first request."""
+    app.config.update(
+        RECORDS_UI_LAZY_ENDPOINTS=True,
+        RECORDS_UI_ENDPOINTS=dict(
+            recid=dict(pid_type="recid", route="/records/<pid_value>"),
+            broken=dict(
+                pid_type="recid",
+                route="/broken/<pid_value>",
+                view_imp="invenio_records_ui.views:nonexistent",
+            ),
+        ),
+    )
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+
+    view = app.view_functions["invenio_records_ui.recid"]
+    assert view._view is None
+    with app.test_client() as client:
+        assert client.get("/records/1").status_code == 200
+        assert view._view is not None
+        assert client.get("/records/1").status_code == 200
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(records_ui, ["check"])
+    assert result.exit_code == 1
+    assert "broken" in result.output
+    assert "recid:" not in result.output
+
+    del app.config["RECORDS_UI_ENDPOINTS"]["broken"]
+    result = runner.invoke(records_ui, ["check"])
+    assert result.exit_code == 0
+
+
+def test_metrics(app, json_v1):
+    """Test timing of the phases of record views."""
+    app.config.update(
+        RECORDS_UI_METRICS=True,
+        RECORDS_UI_METRICS_ENDPOINT="/records-ui/metrics",
+        RECORDS_UI_EXPORT_FORMATS=dict(
+            recid=dict(
+                json=dict(
+                    title="JSON",
+                    serializer=json_v1,
+                    order=1,
+                )
+            )
+        ),
+    )
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+
+    with app.test_client() as client:
+        assert client.get("/records/1").status_code == 200
+        assert client.get("/records/1/export/json").status_code == 200
+
+        metrics = app.extensions["invenio-records-ui"].metrics
+        for phase in ("resolve", "load", "signals", "render"):
+            count, total = metrics.get(phase, "invenio_records_ui.recid", "recid")
+            assert count == 1
+            assert total >= 0
+        for phase in ("resolve", "serialize", "render"):
+            count, total = metrics.get(
+                phase, "invenio_records_ui.recid_export", "recid"
+            )
+            assert count == 1
+
+        # Tombstones are timed as well.
+        assert client.get("/records/2").status_code == 410
+        count, total = metrics.get("render", "invenio_records_ui.recid", "recid")
+        assert count == 2
+
+        res = client.get("/records-ui/metrics")
+        assert res.status_code == 200
+        assert res.mimetype == "text/plain"
+        text = res.get_data(as_text=True)
+        assert "# TYPE invenio_records_ui_phase_seconds histogram" in text
+        assert (
+            'invenio_records_ui_phase_seconds_count{endpoint="invenio_records_ui.'
+            'recid_export",phase="serialize",pid_type="recid"} 1'
+        ) in text
+
+
+def test_server_timing(app):
+    """Test the Server-Timing header."""
+    app.config.update(
+        RECORDS_UI_SERVER_TIMING=True,
+        RECORDS_UI_ENDPOINTS=dict(
+            recid=dict(
+                pid_type="recid",
+                route="/records/<pid_value>",
+                page_cache=True,
+            ),
+        ),
+    )
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+
+    with app.test_client() as client:
+        res = client.get("/records/1")
+        assert res.status_code == 200
+        timing = res.headers["Server-Timing"]
+        assert re.search(r"(^|, )resolve;dur=\d+\.\d{3}(,|$)", timing)
+        assert re.search(r"(^|, )render;dur=\d+\.\d{3}(,|$)", timing)
+        assert 'cache-page;desc="miss"' in timing
+
+        timing = client.get("/records/1").headers["Server-Timing"]
+        assert "render;" not in timing
+        assert 'cache-page;desc="hit"' in timing
+
+        # Tombstones get the header as well.
+        res = client.get("/records/2")
+        assert res.status_code == 410
+        assert "resolve;dur=" in res.headers["Server-Timing"]
+
+    app.config["RECORDS_UI_SERVER_TIMING"] = False
+    with app.test_client() as client:
+        assert "Server-Timing" not in client.get("/records/1").headers
+
+
+def test_batch_view(app):
+    """Test displaying several records in one request."""
+    app.config.update(
+        RECORDS_UI_BATCH_ENDPOINTS=dict(
+            recid_batch=dict(pid_type="recid", route="/records/batch", max_size=10),
+        ),
+    )
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+
+    statements = []
+
+    def count_statement(*args, **kwargs):
+        statements.append(args)
+
+    with app.test_client() as client:
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            res = client.get(
+                "/records/batch?pid_value=1,2,3,4&pid_value=5&pid_value=6,7,99,1"
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+        assert res.status_code == 200
+        assert len(statements) == 1
+
+        res = client.get("/records/batch?pid_value=1,2,3,4,5,6,7,99&format=json")
+        assert res.status_code == 200
+        hits = res.json["hits"]
+        assert [(hit["pid_value"], hit["status"]) for hit in hits] == [
+            ("1", 200),
+            ("2", 410),
+            ("3", 410),
+            ("4", 500),
+            ("5", 302),
+            ("6", 302),
+            ("7", 404),
+            ("99", 404),
+        ]
+        assert "Registered" in hits[0]["html"]
+        assert hits[4]["location"] == "/records/1"
+        assert "location" not in hits[5]
+
+        html = client.get("/records/batch?pid_value=1,2").get_data(as_text=True)
+        assert "Registered" in html
+        assert "Live" not in html
+
+        assert client.get("/records/batch").status_code == 400
+        res = client.get("/records/batch?pid_value=" + ",".join(map(str, range(11))))
+        assert res.status_code == 400
+
+
+def test_batch_view_permission(app):
+    """Test permissions of the batch view."""
+    app.config.update(
+        RECORDS_UI_BATCH_ENDPOINTS=dict(
+            recid_batch=dict(
+                pid_type="recid",
+                route="/records/batch",
+                permission_factory_imp="helpers:only_authenticated_users",
+            ),
+        ),
+    )
+    LoginManager(app).user_loader(lambda user_id: None)
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+
+    with app.test_client() as client:
+        res = client.get("/records/batch?pid_value=1&format=json")
+        assert res.json["hits"] == [dict(pid_value="1", status=401)]
+
+
+def test_bulk_export(app, json_v1, tmp_path):
+    """Test streaming many records in one export format."""
+    app.config.update(
+        RECORDS_UI_EXPORT_FORMATS=dict(
+            recid=dict(
+                json=dict(
+                    title="JSON",
+                    serializer=json_v1,
+                    order=1,
+                    mimetype="application/json",
+                ),
+                old=False,
+            )
+        ),
+        RECORDS_UI_BULK_EXPORT_ENDPOINTS=dict(
+            recid_bulk_export=dict(
+                pid_type="recid", route="/records/bulk/<format>", batch_size=2
+            ),
+        ),
+    )
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+    with app.app_context():
+        for pid_value in ("8", "9", "10"):
+            rec_uuid = uuid.uuid4()
+            PersistentIdentifier.create(
+                "recid",
+                pid_value,
+                object_type="rec",
+                object_uuid=rec_uuid,
+                status=PIDStatus.REGISTERED,
+            )
+            Record.create({"title": "Record {0}".format(pid_value)}, id_=rec_uuid)
+        db.session.commit()
+
+    def titles(res):
+        return [json.loads(line)["title"] for line in res.get_data().splitlines()]
+
+    with app.test_client() as client:
+        res = client.get("/records/bulk/json")
+        assert res.status_code == 200
+        assert res.mimetype == "application/x-ndjson"
+        assert "recid-json.ndjson" in res.headers["Content-Disposition"]
+        # Only registered PIDs with records, ordered numerically.
+        assert titles(res) == ["Registered", "Record 8", "Record 9", "Record 10"]
+
+        res = client.get("/records/bulk/json?start=2&end=9")
+        assert titles(res) == ["Record 8", "Record 9"]
+
+        res = client.get("/records/bulk/json?pid_value=10,2,1&pid_value=9")
+        assert titles(res) == ["Record 10", "Registered", "Record 9"]
+
+        res = client.get("/records/bulk/json?pid_value=8,9&container=zip")
+        assert res.mimetype == "application/zip"
+        with zipfile.ZipFile(io.BytesIO(res.get_data())) as archive:
+            assert archive.namelist() == ["8.json", "9.json"]
+            assert json.loads(archive.read("9.json"))["title"] == "Record 9"
+
+        res = client.get("/records/bulk/json?pid_value=8&container=xml")
+        assert res.get_data(as_text=True).startswith("<?xml")
+
+        assert client.get("/records/bulk/json?container=tar").status_code == 400
+        assert client.get("/records/bulk/old").status_code == 410
+        assert client.get("/records/bulk/none").status_code == 404
+
+    runner = app.test_cli_runner()
+    output = tmp_path / "records.ndjson"
+    result = runner.invoke(
+        records_ui, ["export", "recid", "json", "--start", "9", "-o", str(output)]
+    )
+    assert result.exit_code == 0
+    assert [json.loads(line)["title"] for line in output.read_text().splitlines()] == [
+        "Record 9",
+        "Record 10",
+    ]
+    result = runner.invoke(records_ui, ["export", "recid", "old"])
+    assert result.exit_code == 2
+
+
+def test_export_artifacts(app, json_v1, tmp_path):
+    """Test export artifacts generated on record commit."""
+    app.config.update(
+        RECORDS_UI_EXPORT_ARTIFACTS=True,
+        RECORDS_UI_EXPORT_ARTIFACTS_PATH=str(tmp_path),
+        RECORDS_UI_EXPORT_ARTIFACTS_WORKERS=0,
+        RECORDS_UI_EXPORT_FORMATS=dict(
+            recid=dict(json=dict(title="JSON", serializer=json_v1, order=1))
+        ),
+    )
+    InvenioRecordsUI(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    setup_record_fixture(app)
+    generator = app.extensions["invenio-records-ui"].export_artifacts
+    store = generator.store
+    assert generator.failed == 0
+
+    with app.app_context():
+        record = Record.get_record(PersistentIdentifier.get("recid", "1").object_uuid)
+        revision_id = record.revision_id
+    assert json.loads(store.get("recid", "1", "json", revision_id)) == record
+    # Deleted PIDs have no artifacts.
+    assert store.get("recid", "2", "json", 0) is None
+
+    # The stored artifact is served while its revision matches.
+    store.set("recid", "1", "json", revision_id, "Stored artifact")
+    with app.test_client() as client:
+        res = client.get("/records/1/export/json")
+        assert "Stored artifact" in res.get_data(as_text=True)
+
+    # Committing the record replaces the artifact.
+    update_record_fixture("1", title="Updated")
+    assert store.get("recid", "1", "json", revision_id) is None
+    assert json.loads(store.get("recid", "1", "json", revision_id + 1))["title"] == (
+        "Updated"
+    )
+    with app.test_client() as client:
+        res = client.get("/records/1/export/json")
+        assert "Stored artifact" not in res.get_data(as_text=True)
+        assert "Updated" in res.get_data(as_text=True)
+
+    # Artifacts of existing records can be generated from the command line.
+    store.delete("recid", "1")
+    result = app.test_cli_runner().invoke(records_ui, ["artifacts"])
+    assert result.exit_code == 0
+    assert result.output == "recid: 1\n"
+    assert store.get("recid", "1", "json", revision_id + 1) is not None
@@ -6,6 +6,7 @@
 
 from __future__ import absolute_import, print_function
 
+from invenio_records_ui.cache import LRUCache
 from invenio_records_ui.utils import obj_or_import_string
 
 
@@ -18,3 +19,24 @@ def test_obj_or_import_string(app):
     """Test obj_or_import_string."""
     assert not obj_or_import_string(value=None)
     assert myfunc == obj_or_import_string(value=myfunc)
+
+
+def test_lru_cache():
+    """Test LRU cache."""
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1, tags=["x"])
+    cache.set("b", 2, tags=["x"])
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    # "b" was the least recently used entry.
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.invalidate("x")
+    assert cache.get("a") is None
+    assert len(cache) == 1
+    cache.set("d", 4, timeout=-1)
+    assert cache.get("d") is None
+    cache.delete("c")
+    cache.clear()
+    assert len(cache) == 0